@@ -1,7 +1,7 @@
 # agents/adk_agent.py
-import os
+import functools
 import logging
-from dotenv import load_dotenv
+import threading
 
 from google.adk.agents.base_agent import BaseAgent
 from google.adk.events.event import Event
@@ -9,42 +9,139 @@ from google.genai import types as gen_types
 from google.genai import Client as GenAIClient
 
 # helpers from your runtime (avoid circular imports here)
-from agents.adk_runtime import run_agent_async, create_runner_with_agent
+from agents.adk_runtime import run_agent_async, create_runner_with_agent, clear_response_cache
+from agents import adk_utils
+from agents.config import CONFIG
 
-load_dotenv()
 LOG = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-# Default model to use — change this to any model name from your list if desired
-DEFAULT_GENAI_MODEL = os.getenv("GENAI_MODEL", "models/gemini-2.5-pro")
-API_KEY = os.getenv("GOOGLE_API_KEY")
+_CLIENT_LOCK = threading.Lock()
+
+# Counts HTTP requests issued by the shared GenAI client. Compare against the number
+# of pooled connections to confirm keep-alive reuse.
+_HTTP_STATS = {"requests": 0}
+
+
+def _count_request(request) -> None:
+    _HTTP_STATS["requests"] += 1
+
+
+async def _count_request_async(request) -> None:
+    _HTTP_STATS["requests"] += 1
+
+
+def _http_options():
+    """
+    Build HttpOptions that give the GenAI client a pooled keep-alive transport
+    (HTTP/2 when the 'h2' package is installed). Returns None if this client
+    version cannot take transport arguments, in which case the defaults are used.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+    try:
+        import h2  # noqa: F401  (enables httpx HTTP/2 support)
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    pool_args = {
+        "http2": http2,
+        "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        "timeout": 60.0,
+    }
+    try:
+        return gen_types.HttpOptions(
+            client_args={**pool_args, "event_hooks": {"request": [_count_request]}},
+            async_client_args={**pool_args, "event_hooks": {"request": [_count_request_async]}},
+        )
+    except Exception as e:
+        LOG.debug("GenAI HttpOptions does not accept client args; using defaults: %s", e)
+        return None
+
+
+def _get_client(api_key: str) -> GenAIClient:
+    """
+    Process-wide GenAI client keyed on the API key, so every agent instance
+    (and every Runner built around one) shares a single client and HTTP session.
+    lru_cache alone does not stop two threads from both building a client on a
+    cold cache, so construction is serialized by a lock.
+    """
+    with _CLIENT_LOCK:
+        return _build_client(api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_client(api_key: str) -> GenAIClient:
+    http_options = _http_options()
+    if http_options is not None:
+        try:
+            return GenAIClient(api_key=api_key, http_options=http_options)
+        except Exception as e:
+            LOG.warning("GenAI client rejected pooled http_options, using defaults: %s", e)
+    return GenAIClient(api_key=api_key)
+
+
+def http_stats() -> dict:
+    """
+    Snapshot of HTTP request counters for the shared GenAI client.
+    """
+    return dict(_HTTP_STATS)
+
+
+async def _generate_text(model_name: str, user_text: str) -> str:
+    """
+    Await models.generate_content on the client's async API (client.aio, backed by
+    the pooled async transport) and return the extracted text. run_async runs on
+    the shared runtime loop, so a blocking call here would serialize every
+    concurrent ADK call. Repeated prompts are served by adk_runtime's response cache.
+    """
+    if not CONFIG.api_key:
+        raise RuntimeError("Missing GOOGLE_API_KEY in environment.")
+    client = _get_client(CONFIG.api_key)
+    # Wrap user_text in list for 'contents' (the shape expected by this client)
+    resp = await client.aio.models.generate_content(model=model_name, contents=[user_text])
+    return adk_utils.extract_text_from_model_response(resp)
+
+
+def cache_clear() -> None:
+    """
+    Drop cached GenAI responses (e.g. after changing prompts or models in-process).
+    """
+    clear_response_cache()
 
 
 class AdkLlmAgent(BaseAgent):
     # Keep this annotated so Pydantic/base class rules are happy
     name: str = "adk_llm_agent"
+    # Stream model output as partial Events (lower time-to-first-token for long,
+    # chatty generations). Off by default: classifier/suggester outputs are short
+    # JSON where streaming only adds overhead. Enable with AdkLlmAgent(stream=True).
+    stream: bool = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Ensure a Runner is created for this agent (idempotent)
         create_runner_with_agent(self, app_name="OpsGuardianAgentApp")
 
-        # Lazy initialize GenAI client (so import/time-of-init doesn't explode)
-        if not API_KEY:
+        # GenAI client is created lazily and shared process-wide (see _get_client)
+        if not CONFIG.api_key:
             LOG.warning("GOOGLE_API_KEY not found in environment; GenAI calls will fail.")
-        self._genai_client = None
 
     def _get_genai_client(self):
-        if self._genai_client is None:
-            if not API_KEY:
-                raise RuntimeError("Missing GOOGLE_API_KEY in environment.")
-            self._genai_client = GenAIClient(api_key=API_KEY)
-        return self._genai_client
+        if not CONFIG.api_key:
+            raise RuntimeError("Missing GOOGLE_API_KEY in environment.")
+        return _get_client(CONFIG.api_key)
 
     async def run_async(self, ctx):
         """
         ctx.user_content is an ADK Content object; extract the first part text.
         Call the GenAI models.generate_content and yield an Event with the model text.
+        With stream=True, partial Events are yielded as chunks arrive, followed by
+        one final Event carrying the complete text.
+        GenAI failures propagate (no Event is yielded), so callers retry or fall back
+        instead of parsing an error message as model output.
         """
         # extract incoming user text safely
         user_text = ""
@@ -66,77 +163,36 @@ class AdkLlmAgent(BaseAgent):
             yield ev
             return
 
-        # Model name (can be overridden via env var GENAI_MODEL)
-        model_name = DEFAULT_GENAI_MODEL
+        # Model name (can be overridden via env var GENAI_MODEL, see agents.config)
+        model_name = CONFIG.model
 
-        try:
-            client = self._get_genai_client()
-
-            # Call models.generate_content — wrap user_text in list for 'contents'
-            # (the shape expected by this client)
-            resp = client.models.generate_content(model=model_name, contents=[user_text])
-
-            # resp might be a complex object (Pager/candidate/outputs). Extract text robustly:
-            output_text = None
-
-            # Option 1: resp has 'candidates' attribute (older shapes)
-            if hasattr(resp, "candidates") and resp.candidates:
-                # candidate could be an object with 'content' or 'output' etc.
-                cand = resp.candidates[0]
-                # try common attributes
-                output_text = getattr(cand, "content", None) or getattr(cand, "output", None) or None
-                if isinstance(output_text, list):
-                    # join parts if it's a list of content pieces
-                    try:
-                        output_text = "\n".join(str(p) for p in output_text)
-                    except Exception:
-                        output_text = str(output_text)
-
-            # Option 2: resp has 'outputs' (newer shapes)
-            if not output_text and hasattr(resp, "outputs") and resp.outputs:
-                # outputs often contain items with a 'content' field (string or list)
-                first_out = resp.outputs[0]
-                output_text = getattr(first_out, "content", None) or getattr(first_out, "text", None)
-
-                # If content is list/dict, try to extract text fields
-                if isinstance(output_text, list):
-                    # concatenate text-like entries
-                    pieces = []
-                    for item in output_text:
-                        # item might be a dict-like with 'text' key
-                        txt = None
-                        if hasattr(item, "text"):
-                            txt = getattr(item, "text")
-                        elif isinstance(item, dict):
-                            txt = item.get("text") or item.get("content")
-                        else:
-                            txt = str(item)
-                        if txt:
-                            pieces.append(str(txt))
-                    output_text = "\n".join(pieces)
-
-            # Option 3: resp has a top-level 'content' or 'output' attribute
-            if not output_text and hasattr(resp, "content"):
-                output_text = getattr(resp, "content")
-                if isinstance(output_text, list):
-                    output_text = "\n".join(str(x) for x in output_text)
-
-            # Option 4: fallback to stringifying the response
-            if not output_text:
-                try:
-                    output_text = str(resp)
-                except Exception:
-                    output_text = "GenAI response received but could not extract text."
-
-            # final ensure it's a plain string
-            if not isinstance(output_text, str):
-                output_text = str(output_text)
-
-            out_text = output_text.strip()
-
-        except Exception as e:
-            LOG.error("GenAI client call failed", exc_info=True)
-            out_text = f"Error calling GenAI model: {e}"
+        if self.stream:
+            # Yield each chunk as a partial Event, then a final Event with the full text below.
+            pieces = []
+            try:
+                client = self._get_genai_client()
+                stream = await client.aio.models.generate_content_stream(model=model_name, contents=[user_text])
+                async for chunk in stream:
+                    piece = getattr(chunk, "text", None) or adk_utils.extract_text_from_model_response(chunk)
+                    if not piece:
+                        continue
+                    pieces.append(piece)
+                    yield Event(
+                        invocation_id=ctx.invocation_id,
+                        author=self.name,
+                        content=gen_types.Content(parts=[gen_types.Part(text=piece)]),
+                        partial=True,
+                    )
+                out_text = "".join(pieces).strip()
+            except Exception:
+                LOG.error("GenAI streaming call failed", exc_info=True)
+                raise
+        else:
+            try:
+                out_text = await _generate_text(model_name, user_text)
+            except Exception:
+                LOG.error("GenAI client call failed", exc_info=True)
+                raise
 
         # Build ADK Event with gen_types.Content -> Part(text=str)
         try:
@@ -2,8 +2,29 @@
 # Lightweight classifier that prefers ADK-based classification when available,
 # and falls back to a simple keyword heuristic otherwise.
 
+import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional
+import re
+from types import MappingProxyType
+from typing import Awaitable, Dict, Any, List, Mapping, Optional, Tuple, Union
+
+try:
+    import ahocorasick  # optional: pyahocorasick multi-pattern matcher
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # optional: faster JSON parsing
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Preferred parsing helper, resolved once at import rather than on every response.
+try:
+    from agents.adk_utils import parse_classification_output as _PARSE
+except Exception:
+    _PARSE = None
 
 logger = logging.getLogger(__name__)
 
@@ -25,36 +46,151 @@ _KEYWORD_MAP = {
     "security": ("Security", "P0"),
 }
 
-def _heuristic_classify(title: str, description: str) -> Dict[str, str]:
+def _build_automaton():
+    """
+    Compile _KEYWORD_MAP into an Aho-Corasick automaton so all keywords are found
+    in a single pass over the text. Each payload carries the keyword's position in
+    _KEYWORD_MAP so the earliest mapping still wins, as with the original loop.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (kw, (cat, prio)) in enumerate(_KEYWORD_MAP.items()):
+        automaton.add_word(kw, (rank, cat, prio))
+    automaton.make_automaton()
+    return automaton
+
+_AC = _build_automaton()
+
+# Fallback when pyahocorasick is unavailable: one C-level regex scan. The
+# alternation sits in a lookahead, so a match is tried at every position and
+# overlapping keywords are all seen ("passwordbox" holds both "password" and
+# "db"); alternatives are in _KEYWORD_MAP order, so where several keywords start
+# at one position the earliest mapping is the one reported.
+_KW_RANK = {kw: rank for rank, kw in enumerate(_KEYWORD_MAP)}
+_KW_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_MAP)) + "))", re.I)
+
+def _match_keyword(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Return (category, priority) for the first _KEYWORD_MAP entry found in the
+    (already lowercased) text, or None when no keyword matches.
+    """
+    if _AC is not None:
+        best = None
+        for _, payload in _AC.iter(text):
+            if best is None or payload[0] < best[0]:
+                best = payload
+                if best[0] == 0:
+                    break
+        return (best[1], best[2]) if best else None
+    best_kw = None
+    for m in _KW_RE.finditer(text):
+        kw = m.group(1).lower()
+        if best_kw is None or _KW_RANK[kw] < _KW_RANK[best_kw]:
+            best_kw = kw
+            if _KW_RANK[kw] == 0:
+                break
+    return _KEYWORD_MAP[best_kw] if best_kw else None
+
+# ASCII-only lowercase table and byte-encoded keywords for _match_keyword_ascii.
+_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+_KEYWORD_BYTES = tuple((kw.encode("ascii"), match) for kw, match in _KEYWORD_MAP.items())
+
+# Above this many characters the per-keyword scans of the ASCII path cost more
+# than one multi-pattern pass.
+_LONG_TEXT = 2048
+
+def _match_keyword_ascii(title: str, description: str) -> Optional[Tuple[str, str]]:
+    """
+    Keyword match for ASCII-only tickets using bytes.translate and bytes containment.
+    Same precedence as _match_keyword: the first _KEYWORD_MAP entry found wins.
+    """
+    text = (title.encode("ascii") + b" " + description.encode("ascii")).translate(_LOWER)
+    for kw_b, match in _KEYWORD_BYTES:
+        if kw_b in text:
+            return match
+    return None
+
+# Heuristic results are fixed per (category, priority), so build them once as
+# read-only mappings and hand out the shared objects instead of fresh dicts.
+_RESULTS = {
+    match: MappingProxyType({"category": match[0], "priority": match[1], "used_adk": False})
+    for match in _KEYWORD_MAP.values()
+}
+_DEFAULT_RESULT = MappingProxyType({"category": "Other", "priority": "P2", "used_adk": False})
+
+def _heuristic_classify(title: str, description: str, text: Optional[str] = None) -> Mapping[str, Any]:
     """
     Very small heuristic classifier that looks for keywords in title+description.
-    Returns a dict with category, priority and used_adk=False to indicate fallback.
+    Returns a shared read-only mapping with category, priority and used_adk=False
+    to indicate fallback. Callers that already hold the lowercased text can pass
+    it as `text` to skip rebuilding it.
     """
-    text = f"{title} {description}".lower()
-    for kw, (cat, prio) in _KEYWORD_MAP.items():
-        if kw in text:
-            logger.debug("Heuristic matched keyword=%s -> (%s,%s)", kw, cat, prio)
-            return {"category": cat, "priority": prio, "used_adk": False}
+    if (text is None and _AC is None and len(title) + len(description) <= _LONG_TEXT
+            and title.isascii() and description.isascii()):
+        # ASCII fast path: byte-level lowercase + memchr-backed bytes search,
+        # no Unicode case folding. Long texts skip it: one scan per keyword grows
+        # with K*N, while _match_keyword covers all keywords in a single pass.
+        match = _match_keyword_ascii(title, description)
+    else:
+        if text is None:
+            text = f"{title} {description}".lower()
+        match = _match_keyword(text)
+    if match:
+        logger.debug("Heuristic matched -> (%s,%s)", match[0], match[1])
+        return _RESULTS[match]
     # Default fallback if no keywords matched
-    return {"category": "Other", "priority": "P2", "used_adk": False}
+    return _DEFAULT_RESULT
+
+# Matches a JSON object wrapped in a ```json ... ``` code fence.
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
+
+def _parse_json_classification(raw: Any) -> Optional[Dict[str, str]]:
+    """
+    Fast path for the common case where the model obeyed the prompt and returned
+    a JSON object (optionally inside a code fence). Returns None otherwise.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", "replace")
+    if not isinstance(raw, str):
+        return None
+    text = raw.strip()
+    m = _FENCED_JSON_RE.search(text)
+    if m:
+        text = m.group(1)
+    if not text.startswith("{"):
+        return None
+    try:
+        data = _json_loads(text)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("priority"):
+        return {"category": data.get("category") or "Other", "priority": data["priority"]}
+    return None
 
 def _parse_adk_output(raw: Any) -> Optional[Dict[str, str]]:
     """
     Try several strategies to interpret raw ADK output:
+      0. Parse the response directly as the JSON object the prompt asks for.
       1. Use agents.adk_utils.parse_classification_output if available.
       2. Inspect common structures returned by LLM/ADK (dicts with 'classification',
          lists of 'parts'/'items', or plain string outputs).
     Returns a dict with category and priority, or None if parsing failed.
     """
-    try:
-        # Preferred parsing helper (keeps this module decoupled from ADK internals).
-        from agents.adk_utils import parse_classification_output
-        parsed = parse_classification_output(raw)
-        if parsed and isinstance(parsed, dict) and parsed.get("priority"):
-            return {"category": parsed.get("category") or "Other", "priority": parsed.get("priority")}
-    except Exception:
-        # Helper not available or failed — continue with generic parsing attempts.
-        logger.debug("adk_utils.parse_classification_output not available or failed", exc_info=False)
+    parsed = _parse_json_classification(raw)
+    if parsed:
+        return parsed
+
+    if _PARSE is not None:
+        try:
+            # Preferred parsing helper (keeps this module decoupled from ADK internals).
+            parsed = _PARSE(raw)
+            if parsed and isinstance(parsed, dict) and parsed.get("priority"):
+                return {"category": parsed.get("category") or "Other", "priority": parsed.get("priority")}
+        except Exception:
+            # Helper failed — continue with generic parsing attempts.
+            logger.debug("adk_utils.parse_classification_output failed", exc_info=False)
 
     try:
         # Generic parsing attempts for various ADK output shapes.
@@ -67,29 +203,176 @@ def _parse_adk_output(raw: Any) -> Optional[Dict[str, str]]:
             parts = raw.get("parts") or raw.get("items") or []
             for p in parts:
                 text = (p.get("text") if isinstance(p, dict) else str(p)).lower()
-                for kw, (cat, prio) in _KEYWORD_MAP.items():
-                    if kw in text:
-                        return {"category": cat, "priority": prio}
+                match = _match_keyword(text)
+                if match:
+                    return {"category": match[0], "priority": match[1]}
         elif isinstance(raw, list):
             # List-shaped responses: inspect elements for keyword matches.
             for itm in raw:
-                text = str(itm).lower()
-                for kw, (cat, prio) in _KEYWORD_MAP.items():
-                    if kw in text:
-                        return {"category": cat, "priority": prio}
+                match = _match_keyword(str(itm).lower())
+                if match:
+                    return {"category": match[0], "priority": match[1]}
         elif isinstance(raw, str):
             # Plain text output from LLM — run simple keyword checks.
-            txt = raw.lower()
-            for kw, (cat, prio) in _KEYWORD_MAP.items():
-                if kw in txt:
-                    return {"category": cat, "priority": prio}
+            match = _match_keyword(raw.lower())
+            if match:
+                return {"category": match[0], "priority": match[1]}
     except Exception:
         logger.debug("Generic ADK parse attempts failed", exc_info=False)
 
     # Unable to derive a reliable classification from ADK output.
     return None
 
-def classify_with_adk(normalized_ticket: Dict[str, Any]) -> Dict[str, str]:
+# Classification prompt template, bound once so each call is a single str.format.
+_PROMPT_TMPL = (
+    "Classify this ticket into priority & category.\n"
+    "Title: {t}\n"
+    "Description: {d}\n"
+    'Return JSON: {{"priority":"P0|P1|P2|P3", "category":"..."}}'
+).format
+
+def _build_prompt(title: str, description: str) -> str:
+    """
+    Construct a concise prompt that instructs ADK to return JSON.
+    """
+    return _PROMPT_TMPL(t=title, d=description)
+
+def _classification_from_raw(raw: Any, title: str, description: str) -> Dict[str, str]:
+    """
+    Interpret a raw ADK response, falling back to the heuristic when it cannot be parsed.
+    Shared by the sync and async entry points.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ADK raw classification response: %r", raw)
+    parsed = _parse_adk_output(raw)
+    if parsed:
+        parsed["used_adk"] = True
+        logger.info("Classified with ADK -> %s", parsed)
+        return parsed
+    # ADK responded but we couldn't parse a reliable classification.
+    logger.warning("ADK parse incomplete — falling back to heuristic.")
+    return _heuristic_fallback(title, description)
+
+def _heuristic_fallback(title: str, description: str) -> Dict[str, str]:
+    """
+    Final fallback: use the deterministic heuristic classifier.
+    """
+    # Copy at the public boundary: callers receive a plain, mutable dict.
+    fallback = dict(_heuristic_classify(title, description))
+    logger.info("Heuristic classification -> %s", fallback)
+    return fallback
+
+async def classify_with_adk_async(normalized_ticket: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Async variant of classify_with_adk: awaits the ADK runner (with the same retry,
+    backoff and ADK_RPM pacing as the sync path) instead of spinning up a private
+    event loop, so many tickets can be classified concurrently.
+    Returns the same shape as classify_with_adk.
+    """
+    title = normalized_ticket.get("title", "") or ""
+    description = normalized_ticket.get("description", "") or ""
+
+    try:
+        from agents.adk_runtime import run_agent_with_retries_async
+
+        logger.debug("Awaiting ADK runner for classification (with retries)")
+        raw = await run_agent_with_retries_async("adk_llm_agent", _build_prompt(title, description))
+    except Exception as e:
+        # ADK runtime not present or call failed — log and fall back.
+        logger.warning("ADK classification failed or not available: %s", e, exc_info=False)
+        return _heuristic_fallback(title, description)
+
+    return _classification_from_raw(raw, title, description)
+
+async def classify_many(tickets: List[Dict[str, Any]], concurrency: int = 20) -> List[Dict[str, str]]:
+    """
+    Classify many normalized tickets concurrently, with at most `concurrency`
+    ADK calls in flight. Results are returned in input order.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(ticket: Dict[str, Any]) -> Dict[str, str]:
+        async with sem:
+            return await classify_with_adk_async(ticket)
+
+    return list(await asyncio.gather(*(_bounded(t) for t in tickets)))
+
+_BATCH_PROMPT_HEADER = (
+    "Classify each of the following tickets into priority & category.\n"
+    'Return ONLY a JSON array: [{"id": <number>, "priority":"P0|P1|P2|P3", "category":"..."}]\n'
+    "Tickets:\n"
+)
+
+def _parse_batch_output(raw: Any) -> Dict[int, Dict[str, str]]:
+    """
+    Parse a batch classification response into {index: {"category", "priority"}}.
+    Entries that are missing or malformed are simply absent from the result.
+    """
+    text = raw if isinstance(raw, str) else str(raw)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        items = _json_loads(text[start:end + 1])
+    except ValueError:
+        logger.debug("Batch classification response was not a JSON array")
+        return {}
+    out: Dict[int, Dict[str, str]] = {}
+    if not isinstance(items, list):
+        return out
+    for item in items:
+        if not isinstance(item, dict) or not item.get("priority"):
+            continue
+        try:
+            idx = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        out[idx] = {"category": item.get("category") or "Other", "priority": item["priority"]}
+    return out
+
+def classify_batch_with_adk(tickets: List[Dict[str, Any]], batch_size: int = 16) -> List[Dict[str, str]]:
+    """
+    Classify many normalized tickets with one ADK call per `batch_size` tickets
+    instead of one call per ticket. Tickets the model skips (or whole batches
+    that fail) fall back to the heuristic.
+    Results are returned in input order with the same shape as classify_with_adk.
+    """
+    pairs = [(t.get("title", "") or "", t.get("description", "") or "") for t in tickets]
+    results: List[Optional[Dict[str, str]]] = [None] * len(pairs)
+    pending = range(len(pairs))
+
+    try:
+        from agents.adk_runtime import run_agent_sync_with_retries
+    except Exception as e:
+        logger.warning("ADK classification failed or not available: %s", e, exc_info=False)
+        run_agent_sync_with_retries = None
+
+    for offset in range(0, len(pending), batch_size):
+        chunk = pending[offset:offset + batch_size]
+        parsed: Dict[int, Dict[str, str]] = {}
+        if run_agent_sync_with_retries is not None:
+            lines = "\n".join(
+                f"{n}. title={pairs[i][0]} desc={pairs[i][1]}" for n, i in enumerate(chunk)
+            )
+            try:
+                logger.debug("Calling ADK runner for batch classification of %d tickets", len(chunk))
+                parsed = _parse_batch_output(
+                    run_agent_sync_with_retries("adk_llm_agent", _BATCH_PROMPT_HEADER + lines)
+                )
+            except Exception as e:
+                logger.warning("ADK batch classification failed: %s", e, exc_info=False)
+
+        for n, i in enumerate(chunk):
+            hit = parsed.get(n)
+            if hit:
+                hit["used_adk"] = True
+                results[i] = hit
+            else:
+                results[i] = _heuristic_fallback(*pairs[i])
+
+    return results
+
+def classify_with_adk(normalized_ticket: Dict[str, Any]) -> Union[Dict[str, str], Awaitable[Dict[str, str]]]:
     """
     Attempt to classify the ticket using an ADK runner (with retries).
     If ADK is unavailable or parsing fails, fall back to a lightweight heuristic.
@@ -98,7 +381,21 @@ def classify_with_adk(normalized_ticket: Dict[str, Any]) -> Dict[str, str]:
       - category: string
       - priority: string (e.g. "P0", "P1", "P2")
       - used_adk: boolean flag indicating whether ADK was used successfully
+
+    When called from inside a running event loop (e.g. an async web handler) the
+    blocking runner cannot be used (it raises RunnerAsyncContextError), so the
+    classify_with_adk_async coroutine is returned instead for the caller to await
+    (async code should call classify_with_adk_async directly).
     """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        logger.warning("classify_with_adk called inside a running event loop; returning a "
+                       "coroutine to await (use classify_with_adk_async instead)")
+        return classify_with_adk_async(normalized_ticket)
+
     title = normalized_ticket.get("title", "") or ""
     description = normalized_ticket.get("description", "") or ""
 
@@ -106,33 +403,13 @@ def classify_with_adk(normalized_ticket: Dict[str, Any]) -> Dict[str, str]:
     try:
         from agents.adk_runtime import run_agent_sync_with_retries
 
-        # Construct a concise prompt that instructs ADK to return JSON.
-        prompt = (
-            f"Classify this ticket into priority & category.\n"
-            f"Title: {title}\n"
-            f"Description: {description}\n"
-            f"Return JSON: {{\"priority\":\"P0|P1|P2|P3\", \"category\":\"...\"}}"
-        )
         logger.debug("Calling ADK runner for classification with retries")
-        raw = run_agent_sync_with_retries("adk_llm_agent", prompt)
-        logger.debug("ADK raw classification response: %r", raw)
-
-        # Try to interpret the ADK response into the expected shape.
-        parsed = _parse_adk_output(raw)
-        if parsed:
-            parsed["used_adk"] = True
-            logger.info("Classified with ADK -> %s", parsed)
-            return parsed
-        else:
-            # ADK responded but we couldn't parse a reliable classification.
-            logger.warning("ADK parse incomplete — falling back to heuristic.")
+        raw = run_agent_sync_with_retries("adk_llm_agent", _build_prompt(title, description))
     except Exception as e:
         # ADK runtime not present or call failed — log and fall back.
         logger.warning("ADK classification failed or not available: %s", e, exc_info=False)
+        return _heuristic_fallback(title, description)
 
-    # Final fallback: use the deterministic heuristic classifier.
-    fallback = _heuristic_classify(title, description)
-    logger.info("Heuristic classification -> %s", fallback)
-    return fallback
+    return _classification_from_raw(raw, title, description)
 
-__all__ = ["classify_with_adk"]
+__all__ = ["classify_with_adk", "classify_with_adk_async", "classify_many", "classify_batch_with_adk"]
@@ -1,35 +1,45 @@
 # agents/adk_runner.py
-import os
-import asyncio
-from dotenv import load_dotenv
+import threading
+from typing import Optional
 
 from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
 # Import the minimal agent we just created
 from agents.adk_agent import AdkLlmAgent
-
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-if not API_KEY:
-    raise RuntimeError("Missing GOOGLE_API_KEY in .env")
+from agents.config import CONFIG
 
 # NOTE:
 # We are *not* wiring model objects into Runner directly here.
 # Instead we create a minimal ADK agent (AdkLlmAgent) which will call whichever
 # model client you want. This keeps Runner happy (it needs app_name+agent).
+#
+# The Runner is built on first use rather than at import, so importing this
+# module never fails just because GOOGLE_API_KEY is missing.
 
-session_service = InMemorySessionService()
-
-# instantiate the agent and pass it to Runner
-root_agent = AdkLlmAgent()
+runner: Optional[Runner] = None
+_RUNNER_LOCK = threading.Lock()
 
-# Provide both app_name and agent — this satisfies Runner's validation.
-runner = Runner(
-    app_name="OpsGuardianAgentApp",
-    agent=root_agent,
-    session_service=session_service,
-)
+def get_runner() -> Runner:
+    """
+    Return the module Runner, creating it (and its agent) on first call.
+    Raises RuntimeError if GOOGLE_API_KEY is not configured.
+    """
+    global runner
+    if runner is not None:
+        return runner
+    with _RUNNER_LOCK:
+        if runner is None:
+            if not CONFIG.api_key:
+                raise RuntimeError("Missing GOOGLE_API_KEY in .env")
+            # instantiate the agent and pass it to Runner
+            # Provide both app_name and agent — this satisfies Runner's validation.
+            runner = Runner(
+                app_name="OpsGuardianAgentApp",
+                agent=AdkLlmAgent(),
+                session_service=InMemorySessionService(),
+            )
+    return runner
 
 async def run_agent_async(agent_name: str, prompt: str) -> str:
     """
@@ -37,7 +47,7 @@ async def run_agent_async(agent_name: str, prompt: str) -> str:
     return the final model text (best-effort).
     """
     # use run_debug helper — it creates/continues an in-memory session
-    events = await runner.run_debug(prompt, quiet=True)
+    events = await get_runner().run_debug(prompt, quiet=True)
     # events is a list of Event objects; find last model authored event with text
     for ev in reversed(events):
         if ev.author == agent_name and ev.content:
@@ -3,25 +3,212 @@
 # synchronously or asynchronously, including exponential-backoff retry logic.
 
 import asyncio
+import atexit
+import collections
+import concurrent.futures
+import contextlib
+import errno
+import hashlib
 import logging
+import threading
 import time
 import random
-from typing import Optional
+import re
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
 
 from google.adk.runners import InMemoryRunner  # Optional: used if ADK is available
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
 from agents import adk_utils  # Utilities for extracting text from ADK responses
+from agents.config import CONFIG
 logger = logging.getLogger(__name__)
 
 # Global runner instance — created once per process.
 _RUNNER: Optional[InMemoryRunner] = None
+_RUNNER_LOCK = threading.Lock()
+
+# Context-local runner override (per request/task). When set, it takes precedence
+# over the process-wide _RUNNER, so concurrent callers can each target a
+# different agent without touching the global or taking a lock.
+_RUNNER_VAR: ContextVar[Optional[InMemoryRunner]] = ContextVar("_runner", default=None)
+
+# Persistent event loop used by the sync wrappers. Reusing one loop keeps the
+# runner's HTTP connections and sessions warm instead of rebuilding them per call.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the background event loop, starting it on a daemon thread on first use.
+    """
+    global _LOOP, _LOOP_THREAD
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                _LOOP_THREAD = threading.Thread(target=loop.run_forever, name="adk-runtime-loop", daemon=True)
+                _LOOP_THREAD.start()
+                _LOOP = loop
+                atexit.register(_stop_loop)
+    return _LOOP
+
+def _stop_loop() -> None:
+    """
+    atexit hook: stop the background loop so pending transports close cleanly.
+    """
+    loop, thread = _LOOP, _LOOP_THREAD
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=2.0)
+
+# Bounded LRU of successful responses keyed by (agent_name, prompt) digest.
+# Failed calls (including GenAI error reports, see run_agent_async) are never
+# stored here; model API 4xx rejections go to the short-lived _NEG_CACHE instead.
+# Entries are (monotonic timestamp, text) and expire after _RESP_CACHE_TTL seconds.
+_RESP_CACHE: "collections.OrderedDict[bytes, tuple]" = collections.OrderedDict()
+_RESP_CACHE_LOCK = threading.Lock()
+_RESP_CACHE_MAX = 512
+_RESP_CACHE_TTL = 3600.0
+
+def _resp_cache_key(agent_name: str, prompt: str) -> bytes:
+    return hashlib.blake2b(f"{agent_name}\x00{prompt}".encode("utf-8"), digest_size=16).digest()
+
+def _resp_cache_get(key: bytes) -> Optional[str]:
+    with _RESP_CACHE_LOCK:
+        entry = _RESP_CACHE.get(key)
+        if entry is None:
+            return None
+        ts, text = entry
+        if time.monotonic() - ts > _RESP_CACHE_TTL:
+            del _RESP_CACHE[key]
+            return None
+        _RESP_CACHE.move_to_end(key)
+        return text
+
+def _resp_cache_put(key: bytes, text: str) -> None:
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE[key] = (time.monotonic(), text)
+        _RESP_CACHE.move_to_end(key)
+        while len(_RESP_CACHE) > _RESP_CACHE_MAX:
+            _RESP_CACHE.popitem(last=False)
+
+# Short-lived negative cache: (agent_name, prompt) digests whose last call was
+# rejected by the model API with a 4xx (auth, malformed prompt, ...), mapped to
+# (monotonic timestamp, exception). Repeats re-raise without another round-trip.
+_NEG_CACHE: Dict[bytes, Tuple[float, Exception]] = {}
+_NEG_CACHE_LOCK = threading.Lock()
+_NEG_CACHE_TTL = 60.0
+_NEG_CACHE_MAX = 256
+
+def _neg_cache_get(key: bytes) -> Optional[Exception]:
+    with _NEG_CACHE_LOCK:
+        entry = _NEG_CACHE.get(key)
+        if entry is None:
+            return None
+        ts, exc = entry
+        if time.monotonic() - ts > _NEG_CACHE_TTL:
+            del _NEG_CACHE[key]
+            return None
+        return exc
+
+def _neg_cache_put(key: bytes, exc: Exception) -> None:
+    with _NEG_CACHE_LOCK:
+        now = time.monotonic()
+        if len(_NEG_CACHE) >= _NEG_CACHE_MAX:
+            for k in [k for k, (ts, _) in _NEG_CACHE.items() if now - ts > _NEG_CACHE_TTL]:
+                del _NEG_CACHE[k]
+            if len(_NEG_CACHE) >= _NEG_CACHE_MAX:
+                del _NEG_CACHE[next(iter(_NEG_CACHE))]
+        _NEG_CACHE[key] = (now, exc)
+
+def clear_response_cache() -> None:
+    """
+    Drop all cached ADK responses (including remembered failures).
+    """
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE.clear()
+    with _NEG_CACHE_LOCK:
+        _NEG_CACHE.clear()
+
+class _TokenBucket:
+    """
+    Client-side rate limiter: holds up to `capacity` tokens, refilled at
+    `refill_rate` tokens per second. Each ADK attempt takes one token, so bursts
+    are paced to the provider's RPM up front instead of being answered with 429s.
+
+    Tokens are reserved under a lock (the count may go negative) and the caller
+    then waits out its own deficit, so threads and coroutines share one bucket.
+    """
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = max(1, capacity)
+        self.refill_rate = refill_rate
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_rate)
+            self._last = now
+            self._tokens -= 1.0
+            return -self._tokens / self.refill_rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# Global bucket, enabled by ADK_RPM (and optionally ADK_BURST); None = no client-side limit.
+_BUCKET: Optional[_TokenBucket] = (
+    _TokenBucket(CONFIG.adk_burst, CONFIG.adk_rpm / 60.0) if CONFIG.adk_rpm else None
+)
 
 def get_runner() -> Optional[InMemoryRunner]:
     """
-    Return the global ADK runner instance if it has been initialized.
+    Return the runner for the current context: the context-local override if one
+    is set (see use_runner), otherwise the global instance (None if not initialized).
     """
-    return _RUNNER
+    return _RUNNER_VAR.get() or _RUNNER
+
+@contextlib.contextmanager
+def use_runner(runner: InMemoryRunner) -> Iterator[InMemoryRunner]:
+    """
+    Route ADK calls made in this context (thread or asyncio task) to `runner`.
+    Sync wrappers carry the override onto the background loop.
+    """
+    token = _RUNNER_VAR.set(runner)
+    try:
+        yield runner
+    finally:
+        _RUNNER_VAR.reset(token)
+
+def _with_caller_runner(coro):
+    """
+    Tasks on the background loop do not inherit the submitting thread's context,
+    so re-apply the caller's runner override (if any) inside the task.
+    """
+    runner = _RUNNER_VAR.get()
+    if runner is None:
+        return coro
+
+    async def _bound():
+        _RUNNER_VAR.set(runner)
+        return await coro
+    return _bound()
 
 def create_runner_with_agent(agent_instance, *, app_name: Optional[str] = None) -> InMemoryRunner:
     """
@@ -33,7 +220,11 @@ def create_runner_with_agent(agent_instance, *, app_name: Optional[str] = None)
     if _RUNNER is not None:
         return _RUNNER
 
-    _RUNNER = InMemoryRunner(agent=agent_instance, app_name=app_name)
+    # Double-checked under a lock so concurrent callers cannot build two runners.
+    with _RUNNER_LOCK:
+        if _RUNNER is not None:
+            return _RUNNER
+        _RUNNER = InMemoryRunner(agent=agent_instance, app_name=app_name)
     logger.info("Created global ADK InMemoryRunner with app_name=%s", app_name or _RUNNER.app_name)
     return _RUNNER
 
@@ -42,14 +233,17 @@ async def run_agent_async(agent_name: str, prompt: str, *, quiet: bool = True, v
     Run an ADK agent asynchronously using the runner's debug mode.
     Returns flattened text extracted from ADK events.
 
-    Raises RuntimeError if the runner is not initialized.
+    Raises RuntimeError if the runner is not initialized, or if the agent answered
+    with a GenAI error report instead of model output.
     """
-    if _RUNNER is None:
+    runner = get_runner()
+    if runner is None:
         raise RuntimeError("Runner not initialized. Call create_runner_with_agent(agent_instance) first.")
 
-    logger.debug("Calling runner.run_debug for agent=%s prompt=%s", agent_name, prompt[:120])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Calling runner.run_debug for agent=%s prompt=%s", agent_name, prompt[:120])
     try:
-        events = await _RUNNER.run_debug(
+        events = await runner.run_debug(
             prompt,
             user_id="debug_user",
             session_id=agent_name,
@@ -61,7 +255,14 @@ async def run_agent_async(agent_name: str, prompt: str, *, quiet: bool = True, v
         logger.exception("ADK run_debug raised: %s", e)
         raise
 
-    logger.debug("Raw events returned from runner: %r", events)
+    # repr() of a full event list can be large; only build it when DEBUG is on.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw events returned from runner: %r", events)
+
+    # Streaming agents emit partial chunk events before the final one; only the
+    # complete events are flattened so parsers never see duplicated text.
+    if isinstance(events, list):
+        events = [ev for ev in events if not getattr(ev, "partial", False)]
 
     # Flatten ADK response into text for downstream parsers
     try:
@@ -76,16 +277,98 @@ async def run_agent_async(agent_name: str, prompt: str, *, quiet: bool = True, v
         except Exception:
             text = "ADK response (unserializable)"
 
-    logger.debug("Flattened ADK text (first 300 chars): %s", text[:300])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Flattened ADK text (first 300 chars): %s", text[:300])
+    if text.lstrip().startswith(adk_utils.GENAI_ERROR_PREFIX):
+        # An agent that reports GenAI failures as text: surface it as the failure it
+        # is, so the retry wrapper retries it (429/5xx) and never caches it.
+        raise RuntimeError(text)
     return text
 
-def run_agent_sync(agent_name: str, prompt: str, *, quiet: bool = True, verbose: bool = False) -> str:
+class RunnerAsyncContextError(RuntimeError):
     """
-    Blocking wrapper around run_agent_async — executes in a private event loop.
+    Raised when a blocking run_agent_sync* helper is called from a thread that is
+    already running an event loop. Async callers should await run_agent_async
+    (or an *_async wrapper) instead of blocking their loop.
     """
-    return asyncio.run(run_agent_async(agent_name, prompt, quiet=quiet, verbose=verbose))
 
-def run_agent_sync_with_retries(
+def _in_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def run_agent_sync(
+        agent_name: str,
+        prompt: str,
+        *,
+        quiet: bool = True,
+        verbose: bool = False,
+        timeout: Optional[float] = None
+) -> str:
+    """
+    Blocking wrapper around run_agent_async — submits the coroutine to the shared
+    background event loop and waits up to `timeout` seconds (None = no limit).
+
+    Raises RunnerAsyncContextError when called from inside a running event loop:
+    blocking there would stall that loop (or deadlock on the runtime loop itself).
+    """
+    if _in_running_loop():
+        raise RunnerAsyncContextError(
+            "run_agent_sync() called from a running event loop; await run_agent_async() instead."
+        )
+    fut = asyncio.run_coroutine_threadsafe(
+        _with_caller_runner(run_agent_async(agent_name, prompt, quiet=quiet, verbose=verbose)), _get_loop()
+    )
+    try:
+        return fut.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        raise
+
+# Backoff jitter source. SystemRandom draws from the OS, so worker processes
+# sharing one upstream quota never retry on correlated PRNG sequences.
+_RNG = random.SystemRandom()
+# Matches "Retry-After: 12" and Gemini's "'retryDelay': '4s'" in error messages.
+_RETRY_AFTER_RE = re.compile(r'retry[-_ ]?(?:after|delay)\D{0,5}(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """
+    Seconds requested by a Retry-After hint in the exception message, if any.
+    """
+    m = _RETRY_AFTER_RE.search(str(exc))
+    return float(m.group(1)) if m else None
+
+_SERVER_ERROR_RE = re.compile(r'\b50[0234]\b')
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    True for transient failures worth retrying: rate limits/quota, dropped or
+    timed-out connections (ConnectionError covers ECONNRESET), and HTTP 5xx.
+    """
+    if isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)):
+        return True
+    if isinstance(exc, OSError) and exc.errno in (errno.ECONNRESET, errno.ECONNABORTED, errno.ETIMEDOUT):
+        return True
+    # Detect rate-limit-like and server errors heuristically
+    msg = str(exc).lower()
+    if '429' in msg or 'ratelimit' in msg or 'rate limit' in msg or 'quota' in msg:
+        return True
+    return _SERVER_ERROR_RE.search(msg) is not None
+
+def _is_remote_client_error(exc: Exception) -> bool:
+    """
+    True for a 4xx answer from the model API (google.genai's APIError carries it
+    as .code, httpx errors on .response). Local failures such as a missing runner
+    or API key have no status and are never negative-cached.
+    """
+    status = getattr(exc, "code", None)
+    if not isinstance(status, int):
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500
+
+async def run_agent_with_retries_async(
         agent_name: str,
         prompt: str,
         retries: int = 4,
@@ -96,44 +379,107 @@ def run_agent_sync_with_retries(
         verbose: bool = False
 ) -> str:
     """
-    Run an ADK agent with retry logic intended to handle transient rate-limit or quota failures.
-
-    - Retries when the exception message contains 429 / "ratelimit" / "quota" (case-insensitive).
-    - Uses exponential backoff with jitter.
-    - Raises immediately for non-rate-limit failures.
-    - Returns the text output from ADK if successful.
-
-    Parameters:
-      retries     : max retry attempts
-      base_delay  : initial delay for exponential backoff
-      max_delay   : upper bound on backoff delay
+    Async counterpart of run_agent_sync_with_retries: same retry, backoff and
+    caching rules, but waits with asyncio.sleep so other calls on the loop keep
+    running while one is backing off.
     """
+    key = _resp_cache_key(agent_name, prompt)
+    cached = _resp_cache_get(key)
+    if cached is not None:
+        logger.debug("ADK response cache hit for agent=%s", agent_name)
+        return cached
+    failed = _neg_cache_get(key)
+    if failed is not None:
+        logger.debug("ADK negative cache hit for agent=%s; re-raising %r", agent_name, failed)
+        raise failed
+
     last_exc = None
+    prev_sleep = base_delay
 
     for attempt in range(1, retries + 1):
         try:
             logger.debug("ADK attempt %d/%d for agent=%s", attempt, retries, agent_name)
-            return run_agent_sync(agent_name, prompt, quiet=quiet, verbose=verbose)
+            if _BUCKET is not None:
+                await _BUCKET.acquire_async()
+            text = await run_agent_async(agent_name, prompt, quiet=quiet, verbose=verbose)
+            _resp_cache_put(key, text)
+            return text
 
         except Exception as e:
             last_exc = e
-            msg = str(e).lower()
 
-            # Detect rate-limit-like errors heuristically
-            if '429' in msg or 'ratelimit' in msg or 'rate limit' in msg or 'quota' in msg:
+            if _is_retryable(e):
                 if attempt == retries:
-                    logger.warning("ADK rate-limited and retries exhausted: %s", e)
+                    logger.warning("ADK transient failures and retries exhausted: %s", e)
                     raise
 
-                # Exponential backoff with random jitter
-                delay = min(max_delay, base_delay * (2 ** (attempt - 1))) + random.random() * 0.5
-                logger.warning("ADK rate limit detected. Retry %d/%d after %.1fs", attempt, retries, delay)
-                time.sleep(delay)
+                # Decorrelated jitter: each sleep is drawn from [base, 3 * previous sleep]
+                # so concurrent retriers spread out instead of retrying in lockstep.
+                # A Retry-After hint from the provider is used as the floor.
+                delay = min(max_delay, _RNG.uniform(base_delay, prev_sleep * 3.0))
+                prev_sleep = delay
+                hint = _retry_after(e)
+                if hint is not None:
+                    delay = max(delay, hint)
+                logger.warning("ADK transient failure (%s). Retry %d/%d after %.1fs", e, attempt, retries, delay)
+                await asyncio.sleep(delay)
                 continue
 
-            # Non-rate-limit errors are not retried
-            logger.exception("ADK call failed (non-rate-limit): %s", e)
+            # Permanent errors are not retried; model API rejections are remembered briefly
+            logger.exception("ADK call failed (non-retryable): %s", e)
+            if _is_remote_client_error(e):
+                _neg_cache_put(key, e)
             raise
 
     # If exhausted attempts without returning, re-raise the last exception
     raise last_exc
+
+def run_agent_sync_with_retries(
+        agent_name: str,
+        prompt: str,
+        retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 8.0,
+        *,
+        quiet: bool = True,
+        verbose: bool = False
+) -> str:
+    """
+    Run an ADK agent with retry logic intended to handle transient rate-limit or quota failures.
+
+    - Retries rate-limit/quota errors (429 / "ratelimit" / "quota", case-insensitive),
+      connection resets/timeouts and HTTP 5xx.
+    - Uses exponential backoff with decorrelated jitter, floored by any Retry-After hint.
+    - Raises immediately for other failures; model API 4xx rejections are re-raised
+      for 60s on the same prompt.
+    - Returns the text output from ADK if successful.
+    - Successful responses are cached (LRU, 1h TTL) so repeated prompts skip the call.
+    - Each attempt first takes a token from the ADK_RPM bucket when one is configured.
+
+    Blocking wrapper that runs run_agent_with_retries_async on the shared
+    background loop; raises RunnerAsyncContextError inside a running event loop.
+
+    Parameters:
+      retries     : max retry attempts
+      base_delay  : initial delay for exponential backoff
+      max_delay   : upper bound on backoff delay
+    """
+    key = _resp_cache_key(agent_name, prompt)
+    cached = _resp_cache_get(key)
+    if cached is not None:
+        logger.debug("ADK response cache hit for agent=%s", agent_name)
+        return cached
+
+    if _in_running_loop():
+        # Caller is in an async context; blocking (or retrying) cannot help.
+        raise RunnerAsyncContextError(
+            "run_agent_sync_with_retries() called from a running event loop; "
+            "await run_agent_with_retries_async() instead."
+        )
+    fut = asyncio.run_coroutine_threadsafe(
+        _with_caller_runner(run_agent_with_retries_async(
+            agent_name, prompt, retries, base_delay, max_delay, quiet=quiet, verbose=verbose
+        )),
+        _get_loop(),
+    )
+    return fut.result()
@@ -1,22 +1,84 @@
 # agents/adk_suggester.py (updated: returns used_adk flag and uses retries)
 # Suggestion generator that prefers ADK-based suggestions, with fallback to a static heuristic list.
 
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# ADK helpers resolved once at import rather than on every call. When the ADK
+# runtime cannot be imported, _RUN/_RUN_ASYNC are None and suggestions come
+# straight from the heuristic list.
+try:
+    from agents.adk_runtime import run_agent_sync_with_retries as _RUN
+    from agents.adk_runtime import run_agent_with_retries_async as _RUN_ASYNC
+except Exception as _e:
+    logger.warning("ADK runtime unavailable; suggester will use heuristics: %s", _e)
+    _RUN = _RUN_ASYNC = None
+try:
+    from agents.adk_utils import extract_suggestions_from_adk_response as _EXTRACT
+except Exception:
+    _EXTRACT = None
+
+# Static instruction block for the suggestion prompt. It is identical for every
+# ticket and comes before the ticket-specific fields, so the provider can reuse
+# the cached prefix (implicit prompt caching) and only the tail varies per call.
+_SUGGESTER_SYSTEM_PREFIX = (
+    "Generate 3-6 short, actionable troubleshooting suggestions for the issue described "
+    "after the <<TICKET>> marker.\n"
+    'Return ONLY a JSON array: ["..."]\n'
+    "<<TICKET>>\n"
+)
+
+# Fallback suggestion set used when ADK is unavailable
+# or when ADK output cannot be parsed reliably.
+# Recommendations are intentionally generic and safe.
+_HEURISTIC: Tuple[str, ...] = (
+    "Check service logs for exceptions and stack traces.",
+    "Verify recent deployments and config changes.",
+    "Check upstream/downstream dependency availability (DB, third-party APIs).",
+)
+
 def _heuristic_suggestions() -> List[str]:
     """
-    Fallback suggestion set used when ADK is unavailable
-    or when ADK output cannot be parsed reliably.
-    Recommendations are intentionally generic and safe.
+    Fresh list copy of _HEURISTIC for the public result dict (callers may mutate it).
+    """
+    return list(_HEURISTIC)
+
+@functools.lru_cache(maxsize=1024)
+def _build_prompt(title: str, description: str) -> str:
+    # Static instructions first, ticket fields last (see _SUGGESTER_SYSTEM_PREFIX).
+    # Memoized: alert storms repeat the same (title, description) pair, and the
+    # identical string object then feeds the runtime's response-cache hashing.
+    return _SUGGESTER_SYSTEM_PREFIX + f"Title: {title}\nDescription: {description}\n"
+
+def _suggestions_from_raw(raw: Any) -> Optional[Dict[str, Any]]:
+    """
+    Turn raw ADK output into the used_adk=True result, or None when no
+    suggestions could be extracted.
     """
-    return [
-        "Check service logs for exceptions and stack traces.",
-        "Verify recent deployments and config changes.",
-        "Check upstream/downstream dependency availability (DB, third-party APIs)."
-    ]
+    if _EXTRACT is None:
+        return None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ADK raw suggester response: %r", raw)
+
+    # Attempt to extract suggestions from various ADK output shapes.
+    try:
+        suggestions = _EXTRACT(raw)
+        if suggestions:
+            logger.info("ADK returned %d suggestions", len(suggestions))
+            return {"suggestions": suggestions, "used_adk": True}
+    except Exception:
+        # Extraction helper existed but still failed — fall back gracefully.
+        logger.debug("extract_suggestions_from_adk_response failed", exc_info=False)
+    return None
+
+def _heuristic_result() -> Dict[str, Any]:
+    # Final fallback: return generic troubleshooting suggestions.
+    logger.info("Returning heuristic suggestions")
+    return {"suggestions": _heuristic_suggestions(), "used_adk": False}
 
 def suggest_with_adk(normalized_ticket: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -34,39 +96,58 @@ def suggest_with_adk(normalized_ticket: Dict[str, Any]) -> Dict[str, Any]:
     title = normalized_ticket.get("title", "") or ""
     description = normalized_ticket.get("description", "") or ""
 
+    if _RUN is None:
+        return _heuristic_result()
+
     # Primary strategy: use ADK LLM agent with retry support.
     try:
-        from agents.adk_runtime import run_agent_sync_with_retries
-        from agents.adk_utils import extract_suggestions_from_adk_response
+        logger.debug("Calling ADK runner for suggestions (with retries)")
+        raw = _RUN("adk_llm_agent", _build_prompt(title, description))
+        result = _suggestions_from_raw(raw)
+        if result is not None:
+            return result
 
-        # Prompt clearly instructs ADK to return only a JSON array.
-        prompt = (
-            f"Generate 3-6 short, actionable troubleshooting suggestions for this issue.\n"
-            f"Title: {title}\n"
-            f"Description: {description}\n"
-            f"Return ONLY a JSON array: [\"...\"]"
-        )
+    except Exception as e:
+        # Either ADK runtime is unavailable or the call failed.
+        logger.warning("ADK suggester failed or not available: %s", e, exc_info=False)
 
-        logger.debug("Calling ADK runner for suggestions (with retries)")
-        raw = run_agent_sync_with_retries("adk_llm_agent", prompt)
-        logger.debug("ADK raw suggester response: %r", raw)
+    return _heuristic_result()
 
-        # Attempt to extract suggestions from various ADK output shapes.
-        try:
-            suggestions = extract_suggestions_from_adk_response(raw)
-            if suggestions:
-                logger.info("ADK returned %d suggestions", len(suggestions))
-                return {"suggestions": suggestions, "used_adk": True}
-        except Exception:
-            # Extraction helper existed but still failed — fall back gracefully.
-            logger.debug("extract_suggestions_from_adk_response failed", exc_info=False)
+async def suggest_with_adk_async(normalized_ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async variant of suggest_with_adk with the same result shapes; awaits the
+    ADK call (and any rate-limit backoff) instead of blocking a thread.
+    """
+    title = normalized_ticket.get("title", "") or ""
+    description = normalized_ticket.get("description", "") or ""
+
+    if _RUN_ASYNC is None:
+        return _heuristic_result()
+
+    try:
+        logger.debug("Awaiting ADK runner for suggestions (with retries)")
+        raw = await _RUN_ASYNC("adk_llm_agent", _build_prompt(title, description))
+        result = _suggestions_from_raw(raw)
+        if result is not None:
+            return result
 
     except Exception as e:
-        # Either ADK runtime is unavailable or the call failed.
         logger.warning("ADK suggester failed or not available: %s", e, exc_info=False)
 
-    # Final fallback: return generic troubleshooting suggestions.
-    logger.info("Returning heuristic suggestions")
-    return {"suggestions": _heuristic_suggestions(), "used_adk": False}
+    return _heuristic_result()
+
+async def suggest_many(tickets: List[Dict[str, Any]], concurrency: int = 8) -> List[Dict[str, Any]]:
+    """
+    Generate suggestions for many normalized tickets concurrently, with at most
+    `concurrency` ADK calls in flight (keep it under the provider's rate limit).
+    Results are returned in input order.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(ticket: Dict[str, Any]) -> Dict[str, Any]:
+        async with sem:
+            return await suggest_with_adk_async(ticket)
+
+    return list(await asyncio.gather(*(_bounded(t) for t in tickets)))
 
-__all__ = ["suggest_with_adk"]
+__all__ = ["suggest_with_adk", "suggest_with_adk_async", "suggest_many"]
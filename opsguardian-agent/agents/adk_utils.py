@@ -1,21 +1,83 @@
+import io
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-# Regex helpers used to locate JSON objects/arrays and common wrapper patterns
-_JSON_OBJ_RE = re.compile(r'\{[\s\S]*?\}', re.MULTILINE)
-_JSON_ARR_RE = re.compile(r'\[[\s\S]*?\]', re.MULTILINE)
-CODE_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL)
-TEXT_WRAPPER_RE = re.compile(r'text\s*=\s*("""|\'\'\')?(.*?)(\1)?$', re.DOTALL)
-LEADING_TRIPLE_QUOTE_RE = re.compile(r'^("""|\'\'\')')
-TRAILING_TRIPLE_QUOTE_RE = re.compile(r'("""|\'\'\')$')
+# Prefix of the text older AdkLlmAgent versions yielded when the GenAI call failed.
+# Such output is an error report, never model content, so parsers reject it.
+GENAI_ERROR_PREFIX = "Error calling GenAI model:"
+
+try:
+    import orjson  # optional: faster JSON parsing on the extract_* path
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Wrapper patterns are located with str.find/slicing (_extract_code_fence,
+# _unwrap_text_assignment) and embedded JSON arrays/objects by _find_json_span.
+_FENCE = "```"
+# Triple-quote delimiters stripped from the ends of wrapped output
+_TRIPLE_QUOTES = ('"""', "'''")
+# Line-based suggestion fallback: leading bullets/numbering, and heading lines
+# like "suggestions:" or "Return ONLY..."; applied to the whole text with (?m)
+_BULLET_RE = re.compile(r'(?m)^[ \t]*[\-\*\d\.\)\:]+[ \t]*')
+_HEADING_RE = re.compile(r'(?im)^[ \t]*(suggestions|return only).*$')
+# Classification fallback: a priority token and a known category word
+_PRIORITY_RE = re.compile(r'\b(P[0-3])\b', re.IGNORECASE)
+_CATEGORY_RE = re.compile(
+    r'\b(Database|Network|Application|Access|Security|Payments|Performance|Other|General)\b',
+    re.IGNORECASE
+)
 
 # ---------------------------------------------------------------------
 # Low-level coercion & cleaning utilities
 # ---------------------------------------------------------------------
+# Text-like dict keys checked (in order) by _coerce_to_str
+_COERCE_KEYS = ("text", "content", "output", "message", "result")
+
+def _coerce_dict(x: dict, stack: List[Any]) -> Optional[str]:
+    # common fields to check
+    for key in _COERCE_KEYS:
+        if key in x and isinstance(x[key], str):
+            return x[key]
+    # Handle lists of candidate responses
+    if "candidates" in x and isinstance(x["candidates"], list):
+        stack.extend(reversed(x["candidates"]))
+        return None
+    if "items" in x and isinstance(x["items"], list):
+        stack.extend(reversed(x["items"]))
+        return None
+    # As a last resort use the plain string form
+    return str(x)
+
+def _coerce_seq(x: Any, stack: List[Any]) -> None:
+    stack.extend(reversed(x))
+    return None
+
+def _coerce_other(x: Any, stack: List[Any]) -> Optional[str]:
+    # Subclasses of the dispatched types (rare in ADK payloads) keep their base handling
+    if isinstance(x, str):
+        return x
+    if isinstance(x, dict):
+        return _coerce_dict(x, stack)
+    if isinstance(x, (list, tuple)):
+        return _coerce_seq(x, stack)
+    # fallback to generic string conversion
+    return str(x)
+
+# Exact-type handlers for _coerce_to_str: one dict lookup per node instead of an
+# isinstance chain. Each returns the node's text, or None after queueing children.
+_COERCE_DISPATCH = {
+    str: lambda x, stack: x,
+    dict: _coerce_dict,
+    list: _coerce_seq,
+    tuple: _coerce_seq,
+    type(None): lambda x, stack: None,
+}
+
 def _coerce_to_str(obj: Any) -> str:
     """
     Convert a variety of ADK runner event shapes into a single string.
@@ -23,43 +85,73 @@ def _coerce_to_str(obj: Any) -> str:
     Strategy:
       - Return early for None and plain strings.
       - Inspect dicts for common text-like keys (text, content, output, message, result).
-      - If dict contains lists under 'candidates' or 'items', recurse and join parts.
-      - If no textual key is found, fall back to json.dumps(obj) for debugging or str(obj).
-      - For lists/tuples, recurse and join elements with newlines.
+      - If dict contains lists under 'candidates' or 'items', walk and join parts.
+      - If no textual key is found, fall back to str(obj) (no JSON serialization of the tree).
+      - For lists/tuples, walk and join elements with newlines.
     This function centralizes tolerance for many ADK event shapes.
     """
     if obj is None:
         return ""
     if isinstance(obj, str):
         return obj
-    if isinstance(obj, dict):
-        # common fields to check
-        for key in ("text", "content", "output", "message", "result"):
-            if key in obj and isinstance(obj[key], str):
-                return obj[key]
-        # Handle lists of candidate responses
-        if "candidates" in obj and isinstance(obj["candidates"], list):
-            parts = []
-            for cand in obj["candidates"]:
-                parts.append(_coerce_to_str(cand))
-            return "\n".join(p for p in parts if p)
-        if "items" in obj and isinstance(obj["items"], list):
-            parts = []
-            for it in obj["items"]:
-                parts.append(_coerce_to_str(it))
-            return "\n".join(p for p in parts if p)
-        # As a last resort try JSON dump (useful for debugging)
-        try:
-            return json.dumps(obj)
-        except Exception:
-            return str(obj)
-    if isinstance(obj, (list, tuple)):
-        parts = []
-        for el in obj:
-            parts.append(_coerce_to_str(el))
-        return "\n".join(p for p in parts if p)
-    # fallback to generic string conversion
-    return str(obj)
+
+    # Walk nested shapes with an explicit stack, writing each non-empty leaf
+    # string once into a single buffer (no per-level lists or joins).
+    buf = io.StringIO()
+    wrote = False
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        handler = _COERCE_DISPATCH.get(type(x))
+        s = handler(x, stack) if handler else _coerce_other(x, stack)
+        if s:
+            if wrote:
+                buf.write("\n")
+            buf.write(s)
+            wrote = True
+    return buf.getvalue()
+
+def _extract_code_fence(text: str) -> Optional[str]:
+    """
+    Return the stripped body of the first ```...``` (or ```json ...```) block,
+    or None when text has no complete fence. Two linear str.find scans; unlike a
+    lazy DOTALL regex this cannot backtrack on long outputs with unbalanced fences.
+    """
+    start = text.find(_FENCE)
+    if start == -1:
+        return None
+    end = text.find(_FENCE, start + 3)
+    if end == -1:
+        return None
+    body = text[start + 3:end]
+    if body.startswith("json"):
+        body = body[4:]
+    return body.strip()
+
+def _unwrap_text_assignment(text: str) -> str:
+    """
+    Return what follows the first `text =` / `text=` in text (minus an optional
+    triple-quote pair around it), or text unchanged when there is none.
+    The assignment can sit anywhere, e.g. inside a stringified ADK event
+    ("...Part(text='[...]')..."), where the payload is what follows it.
+    Plain find/slicing; same result as the former TEXT_WRAPPER_RE search.
+    """
+    i = text.find("text")
+    while i != -1:
+        rest = text[i + 4:].lstrip()
+        if rest.startswith("="):
+            rest = rest[1:].lstrip()
+            for q in _TRIPLE_QUOTES:
+                if rest.startswith(q):
+                    rest = rest[3:]
+                    # closing quote only counts at the very end (or before one trailing newline)
+                    body = rest[:-1] if rest.endswith("\n") else rest
+                    if body.endswith(q):
+                        rest = body[:-3]
+                    break
+            return rest.strip()
+        i = text.find("text", i + 1)
+    return text
 
 def _strip_code_fence_and_wrappers(text: str) -> str:
     """
@@ -76,24 +168,80 @@ def _strip_code_fence_and_wrappers(text: str) -> str:
         return ""
     original = text
     # If code fence present, take content inside first fence
-    m = CODE_FENCE_RE.search(text)
-    if m:
-        text = m.group(1).strip()
+    fenced = _extract_code_fence(text)
+    if fenced is not None:
+        text = fenced
     # Remove leading text=""" ... """ wrappers commonly seen
-    m2 = TEXT_WRAPPER_RE.search(text)
-    if m2:
-        # group 2 is inner content
-        text = m2.group(2).strip()
-    # Strip leading/trailing triple quotes if present
-    text = LEADING_TRIPLE_QUOTE_RE.sub("", text)
-    text = TRAILING_TRIPLE_QUOTE_RE.sub("", text)
+    text = _unwrap_text_assignment(text)
+    # Strip leading/trailing triple quotes if present (plain prefix/suffix checks, no regex)
+    if text.startswith(_TRIPLE_QUOTES):
+        text = text[3:]
+    if text.endswith(_TRIPLE_QUOTES):
+        text = text[:-3]
     # Trim whitespace
     text = text.strip()
-    if original != text:
+    if original != text and logger.isEnabledFor(logging.DEBUG):
         logger.debug("Stripped wrapper/code-fence. Before (truncated): %s\nAfter (truncated): %s",
                      original[:200].replace("\n", "\\n"), text[:200].replace("\n", "\\n"))
     return text
 
+def _join_str(items: Any) -> str:
+    """
+    Join list items with newlines, only stringifying items that are not already str.
+    """
+    return "\n".join([p if isinstance(p, str) else str(p) for p in items])
+
+def _extract_candidates(candidates: Any) -> Any:
+    # candidate could be an object with 'content' or 'output' etc.
+    cand = candidates[0]
+    val = getattr(cand, "content", None) or getattr(cand, "output", None)
+    if isinstance(val, list):
+        # join parts if it's a list of content pieces
+        try:
+            return _join_str(val)
+        except Exception:
+            return str(val)
+    return val
+
+_NO_TEXT = object()
+
+def _flatten_parts(items: Any) -> str:
+    """
+    Join the text of content parts with newlines in a single pass.
+    Parts may be objects with a 'text' attribute, dicts with 'text'/'content',
+    or arbitrary values (stringified). Empty parts are skipped.
+    """
+    out: List[str] = []
+    append = out.append
+    for item in items:
+        txt = getattr(item, "text", _NO_TEXT)
+        if txt is _NO_TEXT:
+            txt = (item.get("text") or item.get("content")) if isinstance(item, dict) else item
+        if txt:
+            append(txt if isinstance(txt, str) else str(txt))
+    return "\n".join(out)
+
+def _extract_outputs(outputs: Any) -> Any:
+    # outputs often contain items with a 'content' field (string or list)
+    first_out = outputs[0]
+    val = getattr(first_out, "content", None) or getattr(first_out, "text", None)
+    if isinstance(val, list):
+        return _flatten_parts(val)
+    return val
+
+def _extract_content(content: Any) -> Any:
+    if isinstance(content, list):
+        return _join_str(content)
+    return content
+
+# Response attributes probed in order, with the extractor applied to each.
+# Covers older 'candidates' shapes, newer 'outputs' shapes and top-level 'content'.
+_EXTRACTORS = (
+    ("candidates", _extract_candidates),
+    ("outputs", _extract_outputs),
+    ("content", _extract_content),
+)
+
 # ---------------------------------------------------------------------
 # Public extraction helpers
 # ---------------------------------------------------------------------
@@ -106,29 +254,93 @@ def extract_text_from_adk_response(events: Any) -> str:
     text = _strip_code_fence_and_wrappers(text)
     return text
 
-def _find_json_in_text(text: str) -> Optional[str]:
+def extract_text_from_model_response(resp: Any) -> str:
+    """
+    Extract the model text from a GenAI generate_content response object.
+    Walks _EXTRACTORS and stops at the first attribute that yields text; falls back
+    to str(resp). Returns a stripped plain string.
+    """
+    output_text = None
+    for attr, fn in _EXTRACTORS:
+        val = getattr(resp, attr, None)
+        if val:
+            output_text = fn(val)
+            if output_text:
+                break
+
+    if not output_text:
+        try:
+            output_text = str(resp)
+        except Exception:
+            output_text = "GenAI response received but could not extract text."
+
+    if not isinstance(output_text, str):
+        output_text = str(output_text)
+    return output_text.strip()
+
+def _find_json_span(text: str, open_ch: str, close_ch: str) -> Optional[Tuple[int, int]]:
+    """
+    Return (start, end) of the first balanced open_ch...close_ch span in text, or None.
+
+    Single forward pass from the first open_ch: tracks nesting depth and skips
+    brackets inside JSON string literals (honoring backslash escapes), so nested
+    values like [{"a": [1]}] or "]" inside a string do not end the span early.
+    """
+    start = text.find(open_ch)
+    if start < 0:
+        return None
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+    return None
+
+_JSON_KINDS = {"[": ("[", "]", "array"), "{": ("{", "}", "object")}
+
+def _looks_like_json(text: str) -> bool:
+    # Cheap guard before a speculative whole-text parse: only an object or array
+    # can be useful to callers, and prose would just raise inside the parser.
+    s = text.lstrip()
+    return bool(s) and s[0] in "{["
+
+def _find_json_in_text(text: str, prefer: str = "[") -> Optional[str]:
     """
     Heuristically locate an embedded JSON array or object inside noisy text.
 
-    Preference order:
+    Preference order (default prefer="["):
       1. JSON array (useful for suggestion lists)
       2. JSON object (useful for classification outputs)
+    prefer="{" reverses the order, so callers that need an object are not
+    handed an unrelated bracketed fragment like "[P1]" first.
     Returns the matched substring or None.
     """
     if not text:
         return None
-    # Try array first (suggestions)
-    arr_match = _JSON_ARR_RE.search(text)
-    if arr_match:
-        candidate = arr_match.group(1)
-        logger.debug("Found JSON array in text (truncated): %s", candidate[:200].replace("\n", "\\n"))
-        return candidate
-    # Try object
-    obj_match = _JSON_OBJ_RE.search(text)
-    if obj_match:
-        candidate = obj_match.group(1)
-        logger.debug("Found JSON object in text (truncated): %s", candidate[:200].replace("\n", "\\n"))
-        return candidate
+    order = ("[", "{") if prefer == "[" else ("{", "[")
+    for key in order:
+        open_ch, close_ch, kind = _JSON_KINDS[key]
+        span = _find_json_span(text, open_ch, close_ch)
+        if span:
+            candidate = text[span[0]:span[1]]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found JSON %s in text (truncated): %s", kind, candidate[:200].replace("\n", "\\n"))
+            return candidate
     return None
 
 def parse_classification_output(raw: Any) -> Optional[Dict[str, str]]:
@@ -143,37 +355,35 @@ def parse_classification_output(raw: Any) -> Optional[Dict[str, str]]:
     """
     try:
         text = extract_text_from_adk_response(raw)
-        if not text:
+        if not text or text.lstrip().startswith(GENAI_ERROR_PREFIX):
             return None
 
         # Try direct JSON parse if the whole text is JSON
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                priority = parsed.get("priority")
-                category = parsed.get("category")
-                if priority or category:
-                    return {"priority": priority, "category": category}
-        except Exception:
-            # Not pure JSON — continue
-            pass
+        if _looks_like_json(text):
+            try:
+                parsed = _json_loads(text)
+                if isinstance(parsed, dict):
+                    priority = parsed.get("priority")
+                    category = parsed.get("category")
+                    if priority or category:
+                        return {"priority": priority, "category": category}
+            except Exception:
+                # Not pure JSON — continue
+                pass
 
         # Try to find JSON embedded in noisy text
-        embedded = _find_json_in_text(text)
+        embedded = _find_json_in_text(text, prefer="{")
         if embedded:
             try:
-                parsed = json.loads(embedded)
+                parsed = _json_loads(embedded)
                 if isinstance(parsed, dict):
                     return {"priority": parsed.get("priority"), "category": parsed.get("category")}
             except Exception:
                 logger.debug("Failed to json.loads embedded JSON candidate", exc_info=True)
 
         # Heuristic fallback: look for priority tokens and a known category word
-        priority_match = re.search(r'\b(P0|P1|P2|P3)\b', text, re.IGNORECASE)
-        category_match = re.search(
-            r'\b(Database|Network|Application|Access|Security|Payments|Performance|Other|General)\b',
-            text, re.IGNORECASE
-        )
+        priority_match = _PRIORITY_RE.search(text)
+        category_match = _CATEGORY_RE.search(text)
         if priority_match or category_match:
             return {
                 "priority": priority_match.group(1).upper() if priority_match else None,
@@ -184,11 +394,16 @@ def parse_classification_output(raw: Any) -> Optional[Dict[str, str]]:
         logger.debug("parse_classification_output error", exc_info=True)
     return None
 
+def _clean_entries(items: List[Any]) -> List[str]:
+    # ensure all entries are non-empty, stripped strings
+    return [t for t in (str(x).strip() for x in items) if t]
+
 def extract_suggestions_from_adk_response(raw: Any) -> List[str]:
     """
     Attempt to extract a JSON-array of suggestions from ADK output.
 
     Strategy:
+      0. If the raw text is already a clean JSON array, parse it before any wrapper stripping.
       1. If whole text is a JSON array, parse and return stringified entries.
       2. Look for an embedded JSON array and parse it.
       3. As a fallback, split text into lines and apply heuristics:
@@ -199,53 +414,58 @@ def extract_suggestions_from_adk_response(raw: Any) -> List[str]:
     """
     out: List[str] = []
     try:
-        text = extract_text_from_adk_response(raw)
+        text = _coerce_to_str(raw)
+        if text.lstrip().startswith(GENAI_ERROR_PREFIX):
+            logger.warning("ADK output is a GenAI error report; no suggestions extracted.")
+            return out
+        # 0) Fast path: a clean JSON array parses directly, with no wrapper regexes
+        stripped = text.strip()
+        if stripped[:1] == "[":
+            try:
+                parsed = _json_loads(stripped)
+                if isinstance(parsed, list):
+                    return _clean_entries(parsed)
+            except Exception:
+                pass
+
+        text = _strip_code_fence_and_wrappers(text)
         if not text:
             return out
 
         # 1) If the text is directly a JSON array
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, list):
-                # ensure all entries are strings
-                return [str(x).strip() for x in parsed if str(x).strip()]
-        except Exception:
-            pass
+        if _looks_like_json(text):
+            try:
+                parsed = _json_loads(text)
+                if isinstance(parsed, list):
+                    return _clean_entries(parsed)
+            except Exception:
+                pass
 
         # 2) Try to find embedded JSON array
         embedded = _find_json_in_text(text)
         if embedded:
             try:
-                parsed = json.loads(embedded)
+                parsed = _json_loads(embedded)
                 if isinstance(parsed, list):
-                    return [str(x).strip() for x in parsed if str(x).strip()]
+                    return _clean_entries(parsed)
             except Exception:
                 logger.debug("Failed to parse embedded json array", exc_info=True)
 
-        # 3) Line-based heuristics: split by lines, remove numbering/leading bullets
-        lines = [ln.strip() for ln in re.split(r'\r?\n', text) if ln.strip()]
-        # collect lines that look like suggestions (not headings)
-        candidates = []
-        for ln in lines:
-            # skip lines that look like JSON keys only or too short
-            if len(ln) < 6:
-                continue
-            # strip leading bullets/numbers
-            ln = re.sub(r'^\s*[\-\*\d\.\)\:]+\s*', '', ln)
-            # ignore lines like "suggestions:" or "Return ONLY..."
-            if re.match(r'^(suggestions|return only)', ln, re.IGNORECASE):
+        # 3) Line-based heuristics: strip numbering/leading bullets and headings
+        #    over the whole text at once, then keep non-trivial lines
+        text = _BULLET_RE.sub("", text)
+        text = _HEADING_RE.sub("", text)
+        # One pass: skip short lines (e.g. bare JSON keys), dedupe preserving order
+        # (dict keys), and stop as soon as 6 unique suggestions are collected
+        uniq: Dict[str, None] = {}
+        for ln in map(str.strip, text.splitlines()):
+            if len(ln) < 6 or ln in uniq:
                 continue
-            candidates.append(ln)
-        # if there are clearly multiple candidate lines, return top 3-6
-        if candidates:
-            # remove duplicates while preserving order
-            seen = set()
-            uniq = []
-            for c in candidates:
-                if c not in seen:
-                    seen.add(c)
-                    uniq.append(c)
-            return uniq[:6]
+            uniq[ln] = None
+            if len(uniq) >= 6:
+                break
+        if uniq:
+            return list(uniq)
 
     except Exception:
         logger.debug("extract_suggestions_from_adk_response failed", exc_info=True)
@@ -1,9 +1,91 @@
 # agents/classifier_agent.py
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+try:
+    import ahocorasick  # optional: pyahocorasick multi-pattern matcher
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Keyword -> (category, priority), checked in insertion order; the first keyword
+# found decides, so earlier groups take precedence (Database > Access > Network > Application).
+_KEYWORD_RULES = {
+    "database": ("Database", "P1"),
+    "db": ("Database", "P1"),
+    "sql": ("Database", "P1"),
+    "disk": ("Database", "P1"),
+    "login": ("Access", "P1"),
+    "password": ("Access", "P1"),
+    "unauthorized": ("Access", "P1"),
+    "reset": ("Access", "P1"),
+    "payment": ("Network", "P0"),
+    "gateway": ("Network", "P0"),
+    "latency": ("Application", "P1"),
+    "slow": ("Application", "P1"),
+}
+# Words that escalate a Database match to P0
+_P0_ESCALATORS = ("down", "outage")
+
+
+def _build_automaton():
+    """
+    Compile _KEYWORD_RULES into an Aho-Corasick automaton (single pass over the
+    text regardless of rule count). Payloads carry the rule's rank so the earliest
+    rule still wins. Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (kw, (cat, prio)) in enumerate(_KEYWORD_RULES.items()):
+        automaton.add_word(kw, (rank, cat, prio))
+    automaton.make_automaton()
+    return automaton
+
+
+_AC = _build_automaton()
+
+# Rule and escalator tables packed for the compiled batch scanner; built on first use.
+_RULE_MATCHES = list(_KEYWORD_RULES.values())
+_BATCH_TABLES = None
+_BATCH_TABLES_READY = False
+
+
+def _batch_tables():
+    """
+    (rules, escalators) keyword tables for adk_classifier_fast.first_matches, or
+    None when numba/numpy are not installed.
+    """
+    global _BATCH_TABLES, _BATCH_TABLES_READY
+    if not _BATCH_TABLES_READY:
+        try:
+            from agents.adk_classifier_fast import build_table
+            rules = build_table(list(_KEYWORD_RULES))
+            if rules is not None:
+                _BATCH_TABLES = (rules, build_table(list(_P0_ESCALATORS)))
+        except Exception as e:
+            logger.debug("Compiled batch scanner unavailable: %s", e)
+        _BATCH_TABLES_READY = True
+    return _BATCH_TABLES
+
+
+def _match_rule(haystack: str) -> Optional[Tuple[str, str]]:
+    """
+    Return (category, priority) of the first _KEYWORD_RULES entry found in haystack, or None.
+    """
+    if _AC is not None:
+        best = None
+        for _, payload in _AC.iter(haystack):
+            if best is None or payload[0] < best[0]:
+                best = payload
+                if best[0] == 0:
+                    break
+        return (best[1], best[2]) if best else None
+    for word, match in _KEYWORD_RULES.items():
+        if word in haystack:
+            return match
+    return None
 
 
 class ClassifierAgent:
@@ -18,22 +100,49 @@ class ClassifierAgent:
     def classify(self, normalized_ticket: Dict[str, Any]) -> Dict[str, Any]:
         title = normalized_ticket.get("title", "").lower()
         desc = normalized_ticket.get("description", "").lower()
+
+        # Simple heuristics: substring match over one haystack built once
+        haystack = title + " " + desc
+        match = _match_rule(haystack)
+        escalate = bool(match) and match[0] == "Database" and any(w in haystack for w in _P0_ESCALATORS)
+        return self._result(normalized_ticket, match, escalate)
+
+    def classify_batch(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classify many normalized tickets with the same rules as classify(), using the
+        compiled parallel keyword scanner from adk_classifier_fast when numba is
+        installed (one pass over the whole batch); otherwise classifies one by one.
+        Results are returned in input order.
+        """
+        tables = _batch_tables()
+        if tables is None:
+            return [self.classify(t) for t in tickets]
+        from agents.adk_classifier_fast import first_matches
+
+        encoded = [
+            f"{(t.get('title') or '').lower()} {(t.get('description') or '').lower()}".encode("utf-8")
+            for t in tickets
+        ]
+        rule_idx = first_matches(encoded, tables[0])
+        esc_idx = first_matches(encoded, tables[1])
+        results = []
+        for ticket, ri, ei in zip(tickets, rule_idx, esc_idx):
+            match = _RULE_MATCHES[ri] if ri >= 0 else None
+            results.append(self._result(ticket, match, bool(match) and match[0] == "Database" and ei >= 0))
+        return results
+
+    @staticmethod
+    def _result(
+            normalized_ticket: Dict[str, Any],
+            match: Optional[Tuple[str, str]],
+            escalate: bool
+    ) -> Dict[str, Any]:
         priority = normalized_ticket.get("priority") or "P2"
         category = normalized_ticket.get("category") or "general"
-
-        # Simple heuristics:
-        if any(word in title + desc for word in ("database", "db", "sql", "disk")):
-            category = "Database"
-            priority = "P0" if "down" in title + desc or "outage" in title + desc else "P1"
-        elif any(word in title + desc for word in ("login", "password", "unauthorized", "reset")):
-            category = "Access"
-            priority = "P1"
-        elif "payment" in title + desc or "gateway" in title + desc:
-            category = "Network"
-            priority = "P0"
-        elif "latency" in title + desc or "slow" in title + desc:
-            category = "Application"
-            priority = "P1"
+        if match:
+            category, priority = match
+            if escalate:
+                priority = "P0"
 
         result = {"priority": priority, "category": category}
         logger.info("ClassifierAgent predicted %s for ticket %s", result, normalized_ticket.get("id"))
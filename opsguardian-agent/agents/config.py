@@ -0,0 +1,41 @@
+# agents/config.py
+# Process-wide settings read once at import: .env is loaded a single time and the
+# values are frozen, so modules share one snapshot instead of re-reading the env.
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Immutable runtime configuration.
+      - api_key : GOOGLE_API_KEY used for GenAI calls (None when unset)
+      - model   : GenAI model name (GENAI_MODEL, default models/gemini-2.5-pro)
+      - adk_rpm : client-side ADK request rate limit per minute (ADK_RPM; None = unlimited)
+      - adk_burst : requests allowed back-to-back before ADK_RPM pacing applies (ADK_BURST, default 1)
+      - router_workers : threads in RouterAgent's shared pool for ADK/backend calls (OPS_WORKERS, default 16)
+    """
+    api_key: Optional[str]
+    model: str
+    adk_rpm: Optional[float] = None
+    adk_burst: int = 1
+    router_workers: int = 16
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            model=os.getenv("GENAI_MODEL", "models/gemini-2.5-pro"),
+            adk_rpm=float(os.environ["ADK_RPM"]) if os.getenv("ADK_RPM") else None,
+            adk_burst=int(os.getenv("ADK_BURST", "1")),
+            router_workers=int(os.getenv("OPS_WORKERS", "16")),
+        )
+
+
+CONFIG = Config.from_env()
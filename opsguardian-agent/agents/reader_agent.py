@@ -1,8 +1,60 @@
 import logging
-from typing import Dict, Any, Optional
+import sys
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, Tuple
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Shared instances for the small, fixed vocabularies tickets carry, so thousands of
+# normalized tickets point at one string each instead of per-payload copies.
+_STATUSES = {s: sys.intern(s) for s in ("OPEN", "TRIAGED", "ASSIGNED", "IN_PROGRESS", "RESOLVED", "CLOSED")}
+_PRIORITIES = {s: sys.intern(s) for s in ("P0", "P1", "P2", "P3")}
+_CATEGORIES = {s: sys.intern(s) for s in ("Database", "Access", "Network", "Application", "general")}
+
+
+def _intern(table: Dict[str, str], value: Any) -> Any:
+    # Swap a known value for its shared instance; anything else passes through unchanged.
+    return table.get(value, value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class NormalizedTicket(Mapping):
+    """
+    Normalized ticket produced by ReaderAgent.read().
+
+    A slotted dataclass (no per-instance __dict__), so large batches cost far less
+    memory than one dict per ticket and fields are plain attribute reads
+    (ticket.title). It stays a read-only Mapping over its field names, so code that
+    treats tickets as dicts (ticket.get("title"), ticket["id"], dict(ticket)) keeps
+    working; use to_dict() where a real dict is needed, e.g. for JSON output.
+    """
+    id: Any
+    title: str
+    description: str
+    reporter: str
+    priority: Optional[str]
+    category: Optional[str]
+    status: str
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _TICKET_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TICKET_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_TICKET_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in _TICKET_FIELDS}
+
+
+_TICKET_FIELDS = ("id", "title", "description", "reporter", "priority", "category", "status")
 
 
 class ReaderAgent:
@@ -14,37 +66,64 @@ class ReaderAgent:
       - test harnesses
       - ad-hoc dicts used in agent pipelines
 
-    It transforms them into a stable internal format:
-      {
-        "id": int | None,
-        "title": str,
-        "description": str,
-        "reporter": str,
-        "priority": Optional[str],
-        "category": Optional[str],
-        "status": str,
-        "raw": { ...original payload... }
-      }
+    It transforms them into a stable internal format (a NormalizedTicket):
+      id: int | None
+      title: str
+      description: str
+      reporter: str
+      priority: Optional[str]
+      category: Optional[str]
+      status: str
 
     This normalization reduces branching logic in downstream classifier/suggester components.
+
+    Normalized results are memoized in a bounded LRU (cache_size entries) keyed on the
+    id and every normalized field value, so retries and batch replays of the same
+    ticket skip re-normalization. Tickets without an id are never cached.
+
+    The original payload is not carried on the normalized ticket (downstream agents
+    never read it); the most recent payloads are kept in a small ring buffer for
+    debugging and can be fetched with get_raw(ticket_id).
     """
 
-    def read(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+    def __init__(self, cache_size: int = 1024, raw_history: int = 256):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, NormalizedTicket]" = OrderedDict()
+        self._raw_debug: "deque[Tuple[Any, Dict[str, Any]]]" = deque(maxlen=raw_history)
+        self._lock = threading.Lock()
+
+    def get_raw(self, ticket_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return the most recent original payload read for ticket_id, or None if it is
+        no longer in the debug ring buffer.
+        """
+        with self._lock:
+            for tid, raw in reversed(self._raw_debug):
+                if tid == ticket_id:
+                    return raw
+        return None
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def read(self, raw: Dict[str, Any]) -> NormalizedTicket:
         """
         Normalize a raw ticket dictionary into a consistent ticket structure.
 
         Behaviors:
-          - Accepts dicts or backend Response-like objects (.json()).
+          - Accepts dicts (used as-is) or backend Response-like objects (.json(), parsed once).
           - Unwraps "ticket" nesting if present (some API variants wrap payloads).
           - Extracts ID from multiple possible fields (id, ticketId, ticket_id).
           - Falls back to safe defaults for missing title/description/reporter fields.
-          - Preserves original raw payload under "raw" for debugging and tracing.
+          - Keeps the original raw payload in a debug ring buffer (get_raw) for tracing.
         """
         if raw is None:
             raise ValueError("ReaderAgent.read() received None")
 
-        # Allow backend Response-like objects that expose .json()
-        if hasattr(raw, "json") and callable(raw.json):
+        # Allow backend Response-like objects that expose .json(). BackendClient already
+        # returns parsed dicts, so dicts skip the probe and are never re-parsed.
+        if not isinstance(raw, dict) and callable(getattr(raw, "json", None)):
             try:
                 raw = raw.json()
             except Exception:
@@ -58,23 +137,47 @@ class ReaderAgent:
 
         # Extract ticket_id from various historically-used fields
         ticket_id = raw.get("id") or raw.get("ticketId") or raw.get("ticket_id")
+
+        # Field values after the alias fallbacks, so the cache key below covers
+        # everything the normalized ticket is built from
+        title = raw.get("title") or raw.get("subject") or ""
+        description = raw.get("description") or raw.get("body") or ""
+        reporter = raw.get("reporter") or raw.get("createdBy") or raw.get("reporterEmail") or ""
+        priority, category = raw.get("priority"), raw.get("category")
+        status = raw.get("status") or "OPEN"
+
+        key = None
+        if ticket_id is not None and self.cache_size > 0:
+            key = (ticket_id, title, description, reporter, status, priority, category)
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._raw_debug.append((cached.id, raw))
+                    return cached
         try:
             ticket_id = int(ticket_id) if ticket_id is not None else None
         except (TypeError, ValueError):
             # If the ID isn't numeric, keep the raw value rather than failing
             pass
 
-        # Build normalized structure with safe fallbacks for missing fields
-        normalized = {
-            "id": ticket_id,
-            "title": raw.get("title") or raw.get("subject") or "",
-            "description": raw.get("description") or raw.get("body") or "",
-            "reporter": raw.get("reporter") or raw.get("createdBy") or raw.get("reporterEmail") or "",
-            "priority": raw.get("priority"),
-            "category": raw.get("category"),
-            "status": raw.get("status") or "OPEN",
-            "raw": raw,  # preserve original payload for debugging/inspection
-        }
-
-        logger.info("ReaderAgent normalized ticket id=%s title=%s", normalized["id"], normalized["title"])
+        normalized = NormalizedTicket(
+            id=ticket_id,
+            title=title,
+            description=description,
+            reporter=reporter,
+            priority=_intern(_PRIORITIES, priority),
+            category=_intern(_CATEGORIES, category),
+            status=_intern(_STATUSES, status),
+        )
+
+        with self._lock:
+            # preserve original payload for debugging/inspection (see get_raw)
+            self._raw_debug.append((ticket_id, raw))
+            if key is not None:
+                self._cache[key] = normalized
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        logger.info("ReaderAgent normalized ticket id=%s title=%s", normalized.id, normalized.title)
         return normalized
@@ -1,9 +1,8 @@
 # agents/resolver_agent.py
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 class ResolverAgent:
@@ -15,7 +14,17 @@ class ResolverAgent:
     def __init__(self, backend_client=None):
         self.backend = backend_client
 
-    def resolve(self, normalized_ticket: Dict[str, Any], classification: Dict[str, Any]) -> Dict[str, Any]:
+    def resolve(
+            self,
+            normalized_ticket: Dict[str, Any],
+            classification: Dict[str, Any],
+            raw: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Persist classification/status for a ticket via the backend client.
+        Without a backend, returns a simulated update built from `raw` (the original
+        payload, e.g. ReaderAgent.get_raw(id)) or, failing that, the normalized ticket.
+        """
         ticket_id = normalized_ticket.get("id")
         if not ticket_id:
             raise ValueError("Missing ticket id")
@@ -34,6 +43,6 @@ class ResolverAgent:
         else:
             logger.warning("No backend client provided — returning simulated update")
             # simulated result if backend is not configured
-            simulated = dict(normalized_ticket["raw"])
+            simulated = dict(raw if raw is not None else normalized_ticket.get("raw", normalized_ticket))
             simulated.update(payload)
             return simulated
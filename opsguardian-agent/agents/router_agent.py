@@ -3,16 +3,51 @@
 # and posts suggestions back to the backend. Prefers ADK-driven behavior but gracefully
 # falls back to heuristics when ADK is unavailable.
 
+import asyncio
+import hashlib
 import logging
-from typing import Union, Dict, Any
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Union, Dict, Any, List, Optional, Tuple
 
-from agents.reader_agent import ReaderAgent
-from agents.adk_classifier import classify_with_adk
-from agents.adk_suggester import suggest_with_adk
-from tools.backend_client import BackendClient
+from agents.config import CONFIG
+from agents.reader_agent import NormalizedTicket, ReaderAgent
+
+# The ADK-backed classifier/suggester (and the requests-based backend client)
+# are imported where they are first used, keeping `import agents.router_agent` cheap.
+if TYPE_CHECKING:
+    from tools.backend_client import BackendClient
 
 logger = logging.getLogger(__name__)
 
+# New tickets classified per ADK call in process_tickets_batch
+_CLASSIFY_BATCH_SIZE = 16
+
+
+def _http_errors(status_only: bool = False) -> Tuple[type, ...]:
+    """
+    Exception types the backend client raises for HTTP failures: requests' always,
+    plus httpx's once it has been imported (BackendClient on the httpx transport).
+    status_only narrows them to error-status responses (raise_for_status).
+    """
+    import requests
+
+    errors: Tuple[type, ...] = (requests.HTTPError,) if status_only else (requests.RequestException,)
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        errors += (httpx.HTTPStatusError,) if status_only else (httpx.HTTPError,)
+    return errors
+
+
+def _content_key(ticket: NormalizedTicket) -> str:
+    """
+    Dedup key for a ticket's ADK work within a batch: a 128-bit blake2b digest of title and
+    description, case-folded and stripped so re-sent alerts that differ only in case or padding share it.
+    """
+    text = f"{ticket.title.strip().lower()}\x00{ticket.description.strip().lower()}"
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
 class RouterAgent:
     """
     RouterAgent coordinates the end-to-end processing of a ticket:
@@ -22,13 +57,38 @@ class RouterAgent:
       4. Update ticket on backend with classification results.
       5. Generate suggestions using ADK (or fallback heuristic).
       6. Push suggestions to backend and return a detailed result summary.
+    Where the backend offers PUT /tickets/{id}/triage, steps 4 and 6 are one call.
     """
 
-    def __init__(self, backend: BackendClient):
+    def __init__(self, backend: "BackendClient"):
         # Backend client used for GET/PUT/POST operations.
         self.backend = backend
+        # Probed once: clients without add_suggestions get the generic POST path, and
+        # clients without get_tickets fetch batch ids one GET at a time.
+        self._has_add_suggestions = callable(getattr(backend, "add_suggestions", None))
+        self._has_get_tickets = callable(getattr(backend, "get_tickets", None))
+        # Fused update+suggestions endpoint: None until the first call shows whether the
+        # backend serves it; False for clients without triage_ticket.
+        self._triage_supported: Optional[bool] = None if callable(getattr(backend, "triage_ticket", None)) else False
         # ReaderAgent encapsulates normalization/parsing of raw ticket payloads.
         self.reader = ReaderAgent()
+        # One pool for every batch this agent processes (OPS_WORKERS threads, started on
+        # demand), so a long-running agent does not spin up threads per ticket and
+        # in-flight tickets from concurrent callers share one concurrency cap.
+        self._pool = ThreadPoolExecutor(max_workers=CONFIG.router_workers, thread_name_prefix="router")
+
+    def close(self) -> None:
+        """
+        Shut down the shared worker pool, waiting for in-flight work. Also called on
+        leaving a `with RouterAgent(...)` block.
+        """
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "RouterAgent":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _ensure_ticket(self, ticket_or_id: Union[int, Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -36,19 +96,47 @@ class RouterAgent:
         If given an integer ID, fetch the ticket from backend; if already a dict, return it.
         Raises TypeError for unsupported input types.
         """
-        if isinstance(ticket_or_id, int):
+        # Exact-type checks first (plain int/dict is the common case); isinstance
+        # still accepts subclasses.
+        kind = type(ticket_or_id)
+        if kind is dict:
+            return ticket_or_id
+        if kind is int or isinstance(ticket_or_id, int):
             logger.debug("Fetching ticket from backend id=%s", ticket_or_id)
             return self.backend.get_ticket(ticket_or_id)
         if isinstance(ticket_or_id, dict):
             return ticket_or_id
         raise TypeError("ticket_or_id must be int or dict")
 
+    def _ensure_tickets(self, items: List[Union[int, Dict[str, Any]]]) -> List[Any]:
+        """
+        _ensure_ticket for a whole batch, in input order. Integer ids are handed to
+        one backend.get_tickets call when the client offers it (and there is more
+        than one id), which serves fresh cached tickets and fetches the rest with
+        concurrent per-id GETs; else each id is fetched on the shared pool.
+        A failed fetch takes that ticket's slot as the exception (None for ids the
+        backend does not know), so one bad id does not lose the rest of the batch.
+        """
+        ids = [x for x in items if isinstance(x, int)]
+        if len(ids) < 2 or not self._has_get_tickets:
+            return list(self._pool.map(self._ensure_ticket_settled, items))
+        logger.debug("Fetching %d tickets from backend with get_tickets", len(ids))
+        fetched = iter(self.backend.get_tickets(ids, return_exceptions=True))
+        return [next(fetched) if isinstance(x, int) else self._ensure_ticket(x) for x in items]
+
+    def _ensure_ticket_settled(self, ticket_or_id: Union[int, Dict[str, Any]]) -> Any:
+        # _ensure_ticket, with an HTTP failure returned in place of the ticket
+        try:
+            return self._ensure_ticket(ticket_or_id)
+        except _http_errors() as e:
+            return e
+
     def process_ticket(self, ticket_or_id: Union[int, Dict[str, Any]]):
         """
         Main processing pipeline for a single ticket.
 
         Returns a dictionary containing:
-          - normalized: normalized ticket dict (ReaderAgent output)
+          - normalized: normalized ticket as a dict (ReaderAgent output, via to_dict())
           - classification: classification dict from classifier (may include used_adk flag)
           - used_adk_classification: boolean derived from classification
           - resolver_update: backend response from updating classification/status
@@ -61,70 +149,310 @@ class RouterAgent:
           - Priority-driven status rule: P0/P1 -> ASSIGNED, otherwise -> TRIAGED.
           - All ADK usage is best-effort; boolean flags indicate whether ADK produced usable outputs.
         """
-        ticket_id = ticket_or_id if isinstance(ticket_or_id, int) else ticket_or_id.get("id")
-        logger.info("RouterAgent processing ticket id=%s", ticket_id)
+        (summary, error), = self._process_batch([ticket_or_id])
+        if error is not None:
+            raise error
+        return summary
 
-        # Obtain full ticket dict and normalize its fields for downstream agents.
-        raw_ticket = self._ensure_ticket(ticket_or_id)
-        normalized = self.reader.read(raw_ticket)
+    def process_tickets_batch(
+            self,
+            tickets: List[Union[int, Dict[str, Any]]],
+            max_workers: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many tickets with the network-bound stages overlapped:
+          1. Fetch/ensure all tickets (integer ids through one get_tickets call), then
+             normalize them in-process.
+          2. Run ADK classification and suggestion in parallel, once per distinct
+             title/description; repeats within the batch share those results.
+             New tickets are classified up to 16 per ADK call (classify_batch_with_adk),
+             with the calls for successive groups in flight at once.
+          3. Push all classification/status updates in one bulk backend call, as soon as
+             classifications are in (overlapping suggestion generation still in flight).
+          4. Post suggestions concurrently once the updates have landed.
+        When the backend offers the fused triage endpoint, steps 3 and 4 become one
+        triage call per ticket, issued once its suggestions are ready.
+        Fetch, ADK and triage work runs on the agent's shared pool (OPS_WORKERS threads);
+        max_workers only caps the concurrent PUTs of the bulk update.
+        Returns one result dict per ticket (same shape as process_ticket), in input order.
+        Failures stay with their ticket: a ticket that cannot be fetched or read gets
+        {"id": ..., "status": "failed", "error": ...} in its slot and is skipped by the
+        later stages, and a failed update or triage call comes back as an error-shaped
+        resolver_update (as _post_suggestions does for backend_response).
+        """
+        return [
+            summary if error is None else {
+                "id": t if isinstance(t, int) else t.get("id"), "status": "failed", "error": str(error)
+            }
+            for t, (summary, error) in zip(tickets, self._process_batch(tickets, max_workers))
+        ]
 
-        # Classification step (ADK preferred). The classifier returns a 'used_adk' flag.
-        logger.info("ClassifierAgent classifying ticket id=%s", normalized.get("id"))
-        classification = classify_with_adk(normalized)
-        used_adk_classification = bool(classification.get("used_adk"))
+    def _process_batch(
+            self,
+            tickets: List[Union[int, Dict[str, Any]]],
+            max_workers: int = 16
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        process_tickets_batch's pipeline. Returns a (summary, None) pair per ticket,
+        or (None, exception) for tickets that could not be fetched or normalized.
+        """
+        if not tickets:
+            return []
+        from agents.adk_classifier import classify_batch_with_adk, classify_with_adk
+        from agents.adk_suggester import suggest_with_adk
 
-        # Determine new status using a simple business rule:
-        # - Keep RESOLVED/CLOSED as-is
-        # - If priority is P0 or P1 => ASSIGNED
-        # - Otherwise => TRIAGED
-        current_status = (normalized.get("status") or "").upper()
-        if current_status in ("RESOLVED", "CLOSED"):
-            new_status = current_status
-        else:
-            pr = (classification.get("priority") or "").upper()
-            if pr in ("P0", "P1"):
-                new_status = "ASSIGNED"
+        workers = min(max_workers, len(tickets))
+        pool = self._pool
+        for t in tickets:
+            logger.info("RouterAgent processing ticket id=%s", t if isinstance(t, int) else t.get("id"))
+
+        # Obtain full ticket dicts and normalize their fields for downstream agents;
+        # tickets that fail here are reported and left out of the stages below.
+        errors: List[Optional[Exception]] = [None] * len(tickets)
+        normalized_by_slot: List[Optional[NormalizedTicket]] = [None] * len(tickets)
+        for i, (item, raw) in enumerate(zip(tickets, self._ensure_tickets(tickets))):
+            if raw is None:
+                raw = ValueError(f"Ticket {item} not found")
+            if not isinstance(raw, Exception):
+                try:
+                    normalized_by_slot[i] = self.reader.read(raw)
+                    continue
+                except ValueError as e:
+                    raw = e
+            logger.warning("Skipping ticket %s: %s", item if isinstance(item, int) else item.get("id"), raw)
+            errors[i] = raw
+        ok = [i for i, n in enumerate(normalized_by_slot) if n is not None]
+        if not ok:
+            return [(None, e) for e in errors]
+        normalized_list = [normalized_by_slot[i] for i in ok]
+
+        # Classification and suggestions (ADK preferred) for all tickets at once;
+        # both return a 'used_adk' flag. Repeated content is sent to ADK once; repeats
+        # across batches are answered by adk_runtime's response cache.
+        keys = [_content_key(n) for n in normalized_list]
+        distinct: Dict[str, NormalizedTicket] = {}
+        for key, n in zip(keys, normalized_list):
+            distinct.setdefault(key, n)
+        distinct_keys = list(distinct)
+        class_futs = []
+        for offset in range(0, len(distinct_keys), _CLASSIFY_BATCH_SIZE):
+            group = [distinct[k] for k in distinct_keys[offset:offset + _CLASSIFY_BATCH_SIZE]]
+            if len(group) == 1:
+                class_futs.append(pool.submit(lambda t: [classify_with_adk(t)], group[0]))
             else:
-                new_status = "TRIAGED"
+                class_futs.append(pool.submit(classify_batch_with_adk, group, _CLASSIFY_BATCH_SIZE))
+        sugg_futs = {key: pool.submit(suggest_with_adk, n) for key, n in distinct.items()}
+        class_results = dict(zip(distinct_keys, (c for f in class_futs for c in f.result())))
+        # Per-ticket copies so results for duplicate tickets never alias one dict.
+        classifications = [dict(class_results[k]) for k in keys]
 
-        # Prepare payload to update ticket metadata on backend (priority/category/status).
-        update_payload = {
-            "priority": classification.get("priority"),
-            "category": classification.get("category"),
-            "status": new_status
-        }
-        logger.info("Updating ticket id=%s with %s", normalized.get("id"), update_payload)
-        resolver_update = self.backend.update_ticket(normalized.get("id"), update_payload)
-
-        # Suggestions step: prefer ADK suggester but fall back when necessary.
-        logger.info("Generating suggestions for ticket id=%s", normalized.get("id"))
-        suggester_result = suggest_with_adk(normalized)
-        suggestions_list = suggester_result.get("suggestions") or []
-        used_adk_suggestions = bool(suggester_result.get("used_adk"))
-
-        # Send suggestions to backend; attempt a direct client helper first, then fallback to POST path.
-        suggestions_payload = {"id": normalized.get("id"), "suggestions": suggestions_list}
-        backend_response = None
+        # Prepare payloads to update ticket metadata on backend (priority/category/status).
+        updates = []
+        for normalized, classification in zip(normalized_list, classifications):
+            update_payload = self._update_payload(normalized, classification)
+            logger.info("Updating ticket id=%s with %s", normalized.id, update_payload)
+            updates.append((normalized.id, update_payload))
+        fused = self._triage_supported is not False
+        if not fused:
+            # The backend update only needs the classification: run it while suggestions finish.
+            update_fut = pool.submit(
+                self.backend.bulk_update_tickets, updates, max_workers=workers, return_exceptions=True
+            )
+
+        sugg_results = {key: sugg_fut.result() for key, sugg_fut in sugg_futs.items()}
+        suggester_results = [dict(sugg_results[k]) for k in keys]
+
+        suggestions_payloads = [
+            {"id": n.id, "suggestions": r.get("suggestions") or []}
+            for n, r in zip(normalized_list, suggester_results)
+        ]
+
+        resolver_updates: List[Any] = [None] * len(updates)
+        backend_responses: List[Any] = [None] * len(updates)
+        rest = range(len(updates))
+        if fused:
+            triaged = list(pool.map(
+                self._triage_settled, updates, (p["suggestions"] for p in suggestions_payloads)
+            ))
+            for i, response in enumerate(triaged):
+                resolver_updates[i] = backend_responses[i] = response
+            # Tickets the fused call did not take go through update + post below
+            rest = [i for i, response in enumerate(triaged) if response is None]
+            if rest:
+                update_fut = pool.submit(
+                    self.backend.bulk_update_tickets, [updates[i] for i in rest], max_workers=workers,
+                    return_exceptions=True
+                )
+        if rest:
+            for i, response in zip(rest, update_fut.result()):
+                if isinstance(response, Exception):
+                    logger.warning("Failed to update ticket id=%s: %s", updates[i][0], response)
+                    response = {"status": "failed", "error": str(response)}
+                resolver_updates[i] = response
+            posted = pool.map(self._post_suggestions, [suggestions_payloads[i] for i in rest])
+            for i, response in zip(rest, posted):
+                backend_responses[i] = response
+
+        # Return a comprehensive result summary per ticket for logging/metrics.
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = [(None, e) for e in errors]
+        rows = zip(normalized_list, classifications, resolver_updates, suggestions_payloads,
+                   suggester_results, backend_responses)
+        for i, row in zip(ok, rows):
+            results[i] = (self._summary(*row), None)
+        return results
+
+    async def process_ticket_async(self, ticket_or_id: Union[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Async variant of process_ticket for callers that run an event loop.
+
+        ADK classification and suggestion generation are awaited concurrently on the
+        loop; the blocking backend calls run in worker threads (asyncio.to_thread), and
+        the status update overlaps suggestion generation as in process_tickets_batch (or,
+        with the fused triage endpoint, goes out with the suggestions in one call).
+        Same result shape as process_ticket.
+        """
+        from agents.adk_classifier import classify_with_adk_async
+        from agents.adk_suggester import suggest_with_adk_async
+
+        logger.info("RouterAgent processing ticket id=%s",
+                    ticket_or_id if isinstance(ticket_or_id, int) else ticket_or_id.get("id"))
+        raw = await asyncio.to_thread(self._ensure_ticket, ticket_or_id)
+        normalized = self.reader.read(raw)
+
+        suggestions = asyncio.ensure_future(suggest_with_adk_async(normalized))
         try:
-            backend_response = self.backend.add_suggestions(normalized.get("id"), suggestions_payload)
-        except Exception:
-            # Fallback: construct the REST path and POST manually via the backend client's generic method.
-            logger.info("Fallback: POSTing to /tickets/{id}/suggestions")
-            url = f"/tickets/{normalized.get('id')}/suggestions"
-            try:
-                backend_response = self.backend.post_at_path(url, suggestions_payload)
-            except Exception as e:
-                # If posting fails, log and return an error-shaped backend_response for visibility.
-                logger.warning("Failed to POST suggestions to backend: %s", e)
-                backend_response = {"status": "failed", "error": str(e)}
-
-        # Return a comprehensive result summary to the caller for logging/metrics.
+            classification = await classify_with_adk_async(normalized)
+        except BaseException:
+            suggestions.cancel()
+            raise
+
+        update_payload = self._update_payload(normalized, classification)
+        logger.info("Updating ticket id=%s with %s", normalized.id, update_payload)
+        triaged = None
+        if self._triage_supported is not False:
+            # Fused path: wait for suggestions, then one triage call carries everything.
+            suggester_result = await suggestions
+            triaged = await asyncio.to_thread(
+                self._triage, (normalized.id, update_payload), suggester_result.get("suggestions") or []
+            )
+        if triaged is not None:
+            resolver_update = backend_response = triaged
+        else:
+            update = asyncio.to_thread(self.backend.update_ticket, normalized.id, update_payload)
+            suggester_result, resolver_update = await asyncio.gather(suggestions, update)
+
+        suggestions_payload = {"id": normalized.id, "suggestions": suggester_result.get("suggestions") or []}
+        if triaged is None:
+            backend_response = await asyncio.to_thread(self._post_suggestions, suggestions_payload)
+        return self._summary(normalized, classification, resolver_update, suggestions_payload,
+                             suggester_result, backend_response)
+
+    async def process_tickets_async(
+            self,
+            tickets: List[Union[int, Dict[str, Any]]],
+            concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many tickets on one event loop with at most `concurrency` in flight.
+        Results are returned in input order.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _bounded(ticket: Union[int, Dict[str, Any]]) -> Dict[str, Any]:
+            async with sem:
+                return await self.process_ticket_async(ticket)
+
+        return list(await asyncio.gather(*(_bounded(t) for t in tickets)))
+
+    @staticmethod
+    def _summary(
+            normalized: NormalizedTicket,
+            classification: Dict[str, Any],
+            resolver_update: Any,
+            suggestions_payload: Dict[str, Any],
+            suggester_result: Dict[str, Any],
+            backend_response: Any
+    ) -> Dict[str, Any]:
         return {
-            "normalized": normalized,
+            "normalized": normalized.to_dict(),
             "classification": classification,
-            "used_adk_classification": used_adk_classification,
+            "used_adk_classification": bool(classification.get("used_adk")),
             "resolver_update": resolver_update,
             "suggestions": suggestions_payload,
-            "used_adk_suggestions": used_adk_suggestions,
+            "used_adk_suggestions": bool(suggester_result.get("used_adk")),
             "backend_response": backend_response
         }
+
+    @classmethod
+    def _update_payload(cls, normalized: NormalizedTicket, classification: Dict[str, Any]) -> Dict[str, Any]:
+        # Ticket metadata pushed to the backend (priority/category/status).
+        return {
+            "priority": classification.get("priority"),
+            "category": classification.get("category"),
+            "status": cls._new_status(normalized, classification)
+        }
+
+    @staticmethod
+    def _new_status(normalized: NormalizedTicket, classification: Dict[str, Any]) -> str:
+        """
+        Determine new status using a simple business rule:
+          - Keep RESOLVED/CLOSED as-is
+          - If priority is P0 or P1 => ASSIGNED
+          - Otherwise => TRIAGED
+        """
+        current_status = (normalized.status or "").upper()
+        if current_status in ("RESOLVED", "CLOSED"):
+            return current_status
+        pr = (classification.get("priority") or "").upper()
+        if pr in ("P0", "P1"):
+            return "ASSIGNED"
+        return "TRIAGED"
+
+    def _triage(self, update: Tuple[Any, Dict[str, Any]], suggestions: List[Any]) -> Any:
+        """
+        Push one ticket's update payload and suggestions in a single fused call
+        (backend.triage_ticket). Returns the backend response, or None when the ticket
+        should go through update_ticket + _post_suggestions instead: the backend is known
+        not to serve the endpoint, or answers 404/405 (after which it is not tried again).
+        """
+        if self._triage_supported is False:
+            return None
+
+        ticket_id, update_payload = update
+        try:
+            response = self.backend.triage_ticket(ticket_id, {**update_payload, "suggestions": suggestions})
+        except _http_errors(status_only=True) as e:
+            if e.response is not None and e.response.status_code in (404, 405):
+                logger.info("Backend has no triage endpoint (HTTP %s); using separate update and "
+                            "suggestion calls", e.response.status_code)
+                self._triage_supported = False
+                return None
+            raise
+        self._triage_supported = True
+        return response
+
+    def _triage_settled(self, update: Tuple[Any, Dict[str, Any]], suggestions: List[Any]) -> Any:
+        # _triage for the batch path: an HTTP failure becomes an error-shaped response
+        try:
+            return self._triage(update, suggestions)
+        except _http_errors() as e:
+            logger.warning("Failed to triage ticket id=%s: %s", update[0], e)
+            return {"status": "failed", "error": str(e)}
+
+    def _post_suggestions(self, suggestions_payload: Dict[str, Any]) -> Any:
+        """
+        Send suggestions to backend via the client's add_suggestions helper, or the generic
+        POST path for clients that lack it. HTTP failures are logged and returned as an
+        error-shaped backend_response; other errors propagate.
+        """
+        ticket_id = suggestions_payload.get("id")
+        try:
+            if self._has_add_suggestions:
+                return self.backend.add_suggestions(ticket_id, suggestions_payload)
+            # Construct the REST path and POST via the backend client's generic method.
+            logger.info("Backend client has no add_suggestions; POSTing to /tickets/{id}/suggestions")
+            return self.backend.post_at_path(f"/tickets/{ticket_id}/suggestions", suggestions_payload)
+        except _http_errors() as e:
+            # If posting fails, log and return an error-shaped backend_response for visibility.
+            logger.warning("Failed to POST suggestions to backend: %s", e)
+            return {"status": "failed", "error": str(e)}
@@ -1,8 +1,60 @@
 # agents/suggester_agent.py
 import logging
+import re
+
+try:
+    import ahocorasick  # optional: pyahocorasick multi-pattern matcher
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# (title keyword, description keyword, suggestions): a rule fires when its title
+# keyword appears in the title or its description keyword in the description.
+_RULE_TABLE = (
+    ("database", "db", (
+        "Check database connectivity, credentials, and slow queries.",
+        "Review recent migrations or schema changes.",
+    )),
+    ("network", "timeout", (
+        "Check network latency and packet loss.",
+        "Verify gateway/Load balancer health.",
+    )),
+    ("login", "auth", (
+        "Check authentication service logs.",
+        "Check user provisioning or permission issues.",
+    )),
+)
+# Compiled once with re.I, so the regex path needs no lowercased copies of the text.
+_RULES = tuple(
+    (re.compile(re.escape(title_kw), re.I), re.compile(re.escape(desc_kw), re.I), suggestions)
+    for title_kw, desc_kw, suggestions in _RULE_TABLE
+)
+
+
+def _build_automata():
+    """
+    Compile the rule keywords into one Aho-Corasick automaton per field (title,
+    description) whose payloads are rule indexes, so each field is scanned once
+    for all rules. Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automata = (ahocorasick.Automaton(), ahocorasick.Automaton())
+    for rank, (title_kw, desc_kw, _) in enumerate(_RULE_TABLE):
+        automata[0].add_word(title_kw, rank)
+        automata[1].add_word(desc_kw, rank)
+    for automaton in automata:
+        automaton.make_automaton()
+    return automata
+
+
+_AC = _build_automata()
+_DEFAULT_SUGGESTIONS = (
+    "Review logs around the time of failure.",
+    "Check service health metrics and alerts.",
+)
+
 
 class SuggesterAgent:
     """
@@ -12,27 +64,24 @@ class SuggesterAgent:
     """
 
     def generate(self, ticket: dict) -> dict:
-        title = ticket.get("title", "").lower()
-        description = ticket.get("description", "").lower()
+        title = ticket.get("title", "")
+        description = ticket.get("description", "")
 
         suggestions = []
 
-        # Very simple placeholder rules
-        if "database" in title or "db" in description:
-            suggestions.append("Check database connectivity, credentials, and slow queries.")
-            suggestions.append("Review recent migrations or schema changes.")
-
-        if "network" in title or "timeout" in description:
-            suggestions.append("Check network latency and packet loss.")
-            suggestions.append("Verify gateway/Load balancer health.")
-
-        if "login" in title or "auth" in description:
-            suggestions.append("Check authentication service logs.")
-            suggestions.append("Check user provisioning or permission issues.")
+        # Very simple placeholder rules, applied in table order
+        if _AC is not None:
+            fired = {rank for _, rank in _AC[0].iter(title.lower())}
+            fired.update(rank for _, rank in _AC[1].iter(description.lower()))
+            for rank in sorted(fired):
+                suggestions.extend(_RULE_TABLE[rank][2])
+        else:
+            for title_re, desc_re, rule_suggestions in _RULES:
+                if title_re.search(title) or desc_re.search(description):
+                    suggestions.extend(rule_suggestions)
 
         if not suggestions:
-            suggestions.append("Review logs around the time of failure.")
-            suggestions.append("Check service health metrics and alerts.")
+            suggestions.extend(_DEFAULT_SUGGESTIONS)
 
         logger.info("SuggesterAgent produced %s suggestions", len(suggestions))
         return {
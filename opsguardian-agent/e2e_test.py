@@ -2,11 +2,14 @@
 # e2e_test.py -- improved end-to-end smoke test for OpsGuardian backend + agent
 # Usage:
 #   python e2e_test.py              # create ticket, wait for suggestions (expects agent already running)
+#   python e2e_test.py --count 10   # same for 10 tickets, created and polled in batches
 #   python e2e_test.py --start-agent  # spawn run_suggester.py locally (debug only)
 #
 # Save in repo root and run from the .venv.
 
 import os
+import random
+import selectors
 import time
 import logging
 import json
@@ -14,10 +17,30 @@ import sys
 import argparse
 import subprocess
 import threading
-import atexit
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding of request and response bodies
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+
+    def _pretty(obj: Any) -> str:
+        # Indented JSON for console output and timeout dumps (int keys allowed)
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
 
 # Configure basic logging for the test entrypoint.
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
@@ -27,51 +50,120 @@ logger = logging.getLogger("e2e_test")
 BASE = os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api").rstrip("/") + "/"
 HEADERS = {"Content-Type": "application/json"}
 
-# Global handle for agent subprocess used when running the agent inline for debug.
-agent_proc = None
+# One pooled session for all backend calls, so creating the ticket and every poll
+# reuse keep-alive connections instead of opening a new TCP connection per request.
+# Transient 502/503/504s are retried inside the adapter (up to 3 times, short backoff);
+# a retried POST can at worst leave an extra test ticket behind. After the last retry
+# the error response is returned so raise_for_status() reports it as before.
+SESSION = requests.Session()
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST", "PUT"}),
+    raise_on_status=False,
+)
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+SESSION.headers.update(HEADERS)
+
+def _wait_exit(proc: subprocess.Popen, timeout: float) -> bool:
+    """
+    Wait up to timeout seconds for proc to exit and reap it; returns whether it did.
+    On Linux 5.3+ this blocks on a pidfd (woken exactly when the process exits)
+    instead of Popen.wait's sleep/poll loop; elsewhere it falls back to Popen.wait.
+    """
+    pidfd = None
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except OSError:
+            pidfd = None
+    if pidfd is None:
+        try:
+            proc.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(pidfd, selectors.EVENT_READ)
+            if not sel.select(timeout):
+                return False
+        proc.wait()
+        return True
+    finally:
+        os.close(pidfd)
+
+# Prefix for agent output lines so operator can distinguish agent logs from test logs.
+_AGENT_PREFIX = b"[AGENT] "
 
 # -----------------------------------------------------------------------------
 # Agent subprocess helpers
 # -----------------------------------------------------------------------------
-def start_agent_subprocess():
+@contextmanager
+def agent_subprocess(start: bool = True) -> Iterator[Optional[subprocess.Popen]]:
     """
-    Spawn run_suggester.py as a subprocess and stream its stdout to the test console.
-    This is intended for local debugging only — starts the agent runner in the same repo.
-    The subprocess is registered with atexit to ensure it gets terminated on exit.
+    Context manager that spawns run_suggester.py as a subprocess (when start is true)
+    and streams its stdout to the test console; yields the Popen, or None when not
+    started. This is intended for local debugging only — starts the agent runner in
+    the same repo. On leaving the block the agent is terminated (killed if it has
+    not exited within 5s), so shutdown happens exactly once, when the test is done.
     """
-    global agent_proc
-    if agent_proc is not None:
+    if not start:
+        yield None
         return
 
-    cmd = [sys.executable, "run_suggester.py"]
+    # faulthandler dumps the agent's stacks if it crashes or hangs on a fatal signal.
+    cmd = [sys.executable, "-X", "faulthandler", "run_suggester.py"]
     logger.info("Starting agent subprocess: %s", " ".join(cmd))
 
-    # Start process and capture stdout/stderr for readable test logs.
-    agent_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    # Start process and capture stdout/stderr (as raw bytes) for readable test logs.
+    # PYTHONUNBUFFERED: stdout to a pipe is otherwise block-buffered, and agent output
+    # would only show up in ~8 KiB bursts (or at exit) instead of as it is written.
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
 
     # Background thread that streams subprocess output to our stdout with a prefix.
+    # Output is drained in chunks of up to 64 KiB with os.read and written straight to
+    # the stdout buffer, prefixing at newline boundaries rather than per decoded line.
     def stream_output():
-        if agent_proc.stdout is None:
+        if proc.stdout is None:
             return
-        for line in agent_proc.stdout:
-            # Prefix lines so operator can distinguish agent logs from test logs.
-            print("[AGENT] " + line, end="")
+        fd = proc.stdout.fileno()
+        out = sys.stdout.buffer
+        at_line_start = True
+        while True:
+            data = os.read(fd, 65536)
+            if not data:
+                break
+            chunk = data.replace(b"\n", b"\n" + _AGENT_PREFIX)
+            if at_line_start:
+                chunk = _AGENT_PREFIX + chunk
+            at_line_start = data.endswith(b"\n")
+            if at_line_start:
+                # The next chunk starts the line; don't leave a dangling prefix behind
+                chunk = chunk[:-len(_AGENT_PREFIX)]
+            out.write(chunk)
+            out.flush()
 
     t = threading.Thread(target=stream_output, daemon=True)
     t.start()
 
-    # Ensure subprocess is cleaned up on test exit.
-    def stop_agent():
-        global agent_proc
-        if agent_proc and agent_proc.poll() is None:
+    try:
+        yield proc
+    finally:
+        if proc.poll() is None:
             logger.info("Stopping agent subprocess...")
-            agent_proc.terminate()
-            try:
-                agent_proc.wait(timeout=5)
-            except Exception:
-                agent_proc.kill()
-
-    atexit.register(stop_agent)
+            proc.terminate()
+            if not _wait_exit(proc, timeout=5):
+                proc.kill()
+                proc.wait()
 
 # -----------------------------------------------------------------------------
 # HTTP helpers for interacting with backend
@@ -82,86 +174,268 @@ def create_ticket(payload: Dict[str, Any]) -> Dict[str, Any]:
     Raises requests exceptions on non-2xx responses.
     """
     url = BASE + "tickets"
+    # Debug dumps serialize/decode whole bodies, so only build them when DEBUG is on.
+    debug = logger.isEnabledFor(logging.DEBUG)
     logger.info("POST %s", url)
-    logger.debug("BODY: %s", json.dumps(payload))
-    resp = requests.post(url, json=payload, headers=HEADERS, timeout=10)
+    if debug:
+        logger.debug("BODY: %s", json.dumps(payload))
+    resp = SESSION.post(url, data=_json_dumps_bytes(payload), timeout=10)
     logger.info("STATUS: %s", resp.status_code)
-    logger.debug("RESPONSE HEADERS: %s", resp.headers)
-    logger.debug("RESPONSE TEXT: %s", resp.text[:1000])
+    if debug:
+        logger.debug("RESPONSE HEADERS: %s", resp.headers)
+        logger.debug("RESPONSE TEXT: %s", resp.text[:1000])
     resp.raise_for_status()
-    return resp.json()
+    return _json_loads(resp.content)
+
+# Last (ETag, ticket JSON) seen per ticket id, for conditional GETs while polling.
+_etag_cache: Dict[Any, tuple] = {}
 
 def get_ticket(ticket_id: int) -> Dict[str, Any]:
     """
     GET ticket by id and return its JSON representation.
+    Sends If-None-Match with the last ETag seen for the ticket; on 304 Not Modified
+    the previously decoded ticket is returned without a body transfer or re-parse.
     Raises requests exceptions on non-2xx responses.
     """
     url = BASE + f"tickets/{ticket_id}"
     logger.debug("GET %s", url)
-    r = requests.get(url, timeout=10)
+    cached = _etag_cache.get(ticket_id)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    r = SESSION.get(url, headers=headers, timeout=10)
+    if r.status_code == 304 and cached:
+        return cached[1]
     r.raise_for_status()
-    return r.json()
+    t = _json_loads(r.content)
+    etag = r.headers.get("ETag")
+    if etag:
+        _etag_cache[ticket_id] = (etag, t)
+    return t
+
+def create_tickets_bulk(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create many tickets in one request (POST tickets:batch with a JSON list) and return
+    the created tickets in payload order. Falls back to one create_ticket call per
+    payload when the backend has no batch endpoint (404/405).
+    """
+    url = BASE + "tickets:batch"
+    logger.info("POST %s (%d tickets)", url, len(payloads))
+    resp = SESSION.post(url, data=_json_dumps_bytes(payloads), timeout=30)
+    if resp.status_code in (404, 405):
+        logger.info("No batch create endpoint (HTTP %s); creating tickets one by one", resp.status_code)
+        return [create_ticket(p) for p in payloads]
+    resp.raise_for_status()
+    created = _json_loads(resp.content)
+    if not isinstance(created, list) or len(created) != len(payloads):
+        raise RuntimeError(f"Unexpected batch create response: {str(created)[:1000]}")
+    return created
+
+def get_tickets(ticket_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch many tickets keyed by id, with concurrent get_ticket calls on the shared
+    session (the backend's GET /tickets has no ids filter, so a listing would pull
+    the whole table on every poll).
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(ticket_ids)))) as pool:
+        return dict(zip(ticket_ids, pool.map(get_ticket, ticket_ids)))
 
 # -----------------------------------------------------------------------------
 # Polling / wait logic
 # -----------------------------------------------------------------------------
-def wait_for_processing(ticket_id: int, timeout: int = 90, poll_interval: float = 2.0) -> Dict[str, Any]:
-    """
-    Poll the backend until the specified ticket is processed.
+# Last logged (status, category, priority, suggestions_count) per ticket, so polls
+# that see no change are not logged at INFO again.
+_last_logged_state: Dict[Any, tuple] = {}
 
-    Success condition:
+def _find_suggestions(t: Dict[str, Any]) -> Any:
+    """
+    Return the ticket's suggestions from the first supported shape that holds them
+    (t.suggestions, t.resolver.suggestions, t.suggestions_present), or None.
+    Each field is looked up once; the backend's own shape (t.suggestions) is first.
+    """
+    found = t.get("suggestions")
+    if found is not None:
+        return found
+    resolver = t.get("resolver")
+    if isinstance(resolver, dict):
+        found = resolver.get("suggestions")
+        if found is not None:
+            return found
+    # Backwards-compatible boolean flag used by older implementations.
+    return t.get("suggestions_present")
+
+def _check_processed(ticket_id: int, t: Dict[str, Any], attempt: int) -> bool:
+    """
+    Log the ticket's state (when it changed since the last log) and report whether
+    it counts as processed:
       - ticket.status == "ASSIGNED"
       - suggestions exist (supports multiple shapes: list, boolean flag, nested resolver.suggestions)
+    """
+    # Read common metadata fields for logging
+    status = (t.get("status") or "UNKNOWN")
+    category = t.get("category")
+    priority = t.get("priority")
+
+    # Support different shapes for where suggestions may be stored.
+    suggestions_obj = _find_suggestions(t)
+
+    # Normalize suggestions to a simple count for acceptance criteria.
+    suggestions_count = 0
+    if isinstance(suggestions_obj, list):
+        suggestions_count = len(suggestions_obj)
+    elif isinstance(suggestions_obj, bool):
+        suggestions_count = 1 if suggestions_obj else 0
+    elif suggestions_obj is None:
+        suggestions_count = 0
+
+    state = (status, category, priority, suggestions_count)
+    if _last_logged_state.get(ticket_id) != state:
+        _last_logged_state[ticket_id] = state
+        logger.info(
+            "Ticket %s status=%s category=%s priority=%s suggestions_count=%s (attempt=%d)",
+            ticket_id, status, category, priority, suggestions_count, attempt
+        )
+    else:
+        logger.debug("Ticket %s unchanged (attempt=%d)", ticket_id, attempt)
+
+    # Success condition: assigned + non-empty suggestions
+    if suggestions_count > 0 and status.upper() == "ASSIGNED":
+        logger.info("Ticket %s processed: assigned + suggestions present", ticket_id)
+        return True
+    return False
+
+def _timeout_error(ticket_id: int, t: Optional[Dict[str, Any]]) -> RuntimeError:
+    # Include last-seen ticket state in the raised error.
+    pretty = _pretty(t)
+    return RuntimeError(f"Timeout waiting for ticket {ticket_id}. Last state:\n{pretty}")
+
+def wait_for_events(ticket_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+    """
+    Follow server-sent ticket updates (GET tickets/{id}/events, text/event-stream) over
+    one open connection until the ticket is processed, instead of polling.
+
+    Returns the processed ticket, or None when the backend does not offer the stream
+    (404/405 or a non event-stream response) or closes it early, so the caller can
+    fall back to polling. Raises RuntimeError on timeout.
+    """
+    url = BASE + f"tickets/{ticket_id}/events"
+    start = time.monotonic()
+    last = None
+    attempt = 0
+    try:
+        resp = SESSION.get(url, stream=True, timeout=(5, timeout), headers={"Accept": "text/event-stream"})
+    except requests.RequestException as e:
+        logger.debug("Event stream unavailable (%s); falling back to polling", e)
+        return None
+    with resp:
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status_code in (404, 405) or not content_type.startswith("text/event-stream"):
+            logger.debug("No event stream at %s (HTTP %s); falling back to polling", url, resp.status_code)
+            return None
+        resp.raise_for_status()
+        logger.info("Subscribed to %s", url)
+        data = []
+        try:
+            # chunk_size=1: larger reads block until the buffer fills, delaying events
+            for line in resp.iter_lines(chunk_size=1, decode_unicode=True):
+                if time.monotonic() - start > timeout:
+                    raise _timeout_error(ticket_id, last)
+                if line is None:
+                    continue
+                if line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                    continue
+                if line or not data:
+                    # id:/event:/retry: fields and keep-alive comments are not needed here
+                    continue
+                # A blank line ends the event; its data lines form one JSON document
+                payload, data = "\n".join(data), []
+                try:
+                    t = _json_loads(payload)
+                except ValueError:
+                    logger.debug("Skipping non-JSON event: %s", payload[:200])
+                    continue
+                if not isinstance(t, dict):
+                    continue
+                last = t
+                attempt += 1
+                if _check_processed(ticket_id, t, attempt):
+                    return t
+        except requests.RequestException as e:
+            # A read timeout means no update arrived within the whole budget
+            if time.monotonic() - start >= timeout:
+                raise _timeout_error(ticket_id, last)
+            logger.info("Event stream dropped (%s); falling back to polling", e)
+    return None
+
+def wait_for_processing(
+        ticket_id: int,
+        timeout: int = 90,
+        poll_interval: float = 2.0,
+        initial_poll: float = 0.1
+) -> Dict[str, Any]:
+    """
+    Wait until the specified ticket is processed (see _check_processed).
+
+    Subscribes to the backend's event stream first (wait_for_events). If the backend
+    has no stream, polls instead: polls back off exponentially from initial_poll
+    (plus a little jitter) up to poll_interval, so fast runs are noticed quickly and slow
+    runs issue few requests.
 
     On timeout this raises RuntimeError and includes the last-seen ticket JSON for debugging.
     """
-    start = time.time()
+    start = time.monotonic()
+    t = wait_for_events(ticket_id, timeout)
+    if t is not None:
+        return t
+
     attempt = 0
+    delay = min(initial_poll, poll_interval)
 
     while True:
         attempt += 1
         t = get_ticket(ticket_id)
+        if _check_processed(ticket_id, t, attempt):
+            return t
 
-        # Read common metadata fields for logging
-        status = (t.get("status") or "UNKNOWN")
-        category = t.get("category")
-        priority = t.get("priority")
-
-        # Support different shapes for where suggestions may be stored.
-        suggestions_obj = None
-        if t.get("suggestions") is not None:
-            suggestions_obj = t.get("suggestions")
-        elif isinstance(t.get("resolver"), dict) and t["resolver"].get("suggestions") is not None:
-            suggestions_obj = t["resolver"].get("suggestions")
-        elif t.get("suggestions_present") is not None:
-            # Backwards-compatible boolean flag used by older implementations.
-            suggestions_obj = t.get("suggestions_present")
-
-        # Normalize suggestions to a simple count for acceptance criteria.
-        suggestions_count = 0
-        if isinstance(suggestions_obj, list):
-            suggestions_count = len(suggestions_obj)
-        elif isinstance(suggestions_obj, bool):
-            suggestions_count = 1 if suggestions_obj else 0
-        elif suggestions_obj is None:
-            suggestions_count = 0
+        if time.monotonic() - start > timeout:
+            raise _timeout_error(ticket_id, t)
 
-        logger.info(
-            "Ticket %s status=%s category=%s priority=%s suggestions_count=%s (attempt=%d)",
-            ticket_id, status, category, priority, suggestions_count, attempt
-        )
+        time.sleep(delay + random.random() * 0.05)
+        delay = min(delay * 2, poll_interval)
 
-        # Success condition: assigned + non-empty suggestions
-        if status.upper() == "ASSIGNED" and suggestions_count > 0:
-            logger.info("Ticket %s processed: assigned + suggestions present", ticket_id)
-            return t
+def wait_for_processing_many(
+        ticket_ids: List[int],
+        timeout: int = 90,
+        poll_interval: float = 2.0,
+        initial_poll: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Poll until every ticket in ticket_ids is processed, fetching all still-pending
+    tickets with one get_tickets call per cycle (same backoff as wait_for_processing).
+    Returns the processed tickets in ticket_ids order; on timeout raises RuntimeError
+    with the last-seen state of the tickets still pending.
+    """
+    start = time.monotonic()
+    attempt = 0
+    delay = min(initial_poll, poll_interval)
+    pending = list(ticket_ids)
+    done: Dict[int, Dict[str, Any]] = {}
 
-        # Timeout handling: include last-seen ticket state in the raised error.
-        if time.time() - start > timeout:
-            pretty = json.dumps(t, indent=2, default=str)
-            raise RuntimeError(f"Timeout waiting for ticket {ticket_id}. Last state:\n{pretty}")
+    while True:
+        attempt += 1
+        latest = get_tickets(pending)
+        for ticket_id in pending:
+            if _check_processed(ticket_id, latest[ticket_id], attempt):
+                done[ticket_id] = latest[ticket_id]
+        pending = [i for i in pending if i not in done]
+        if not pending:
+            return [done[i] for i in ticket_ids]
+
+        if time.monotonic() - start > timeout:
+            pretty = _pretty({i: latest[i] for i in pending})
+            raise RuntimeError(f"Timeout waiting for tickets {pending}. Last state:\n{pretty}")
 
-        time.sleep(poll_interval)
+        time.sleep(delay + random.random() * 0.05)
+        delay = min(delay * 2, poll_interval)
 
 # -----------------------------------------------------------------------------
 # Main CLI / test flow
@@ -170,49 +444,65 @@ def main():
     """
     CLI entrypoint:
       - Optionally starts agent subprocess for local debug (--start-agent).
-      - Creates a unique test ticket.
-      - Polls until the agent processes the ticket or timeout occurs.
+      - Creates --count unique test tickets (batched when more than one).
+      - Waits until the agent processes every ticket or timeout occurs.
       - Exits with non-zero code on failures for CI compatibility.
     """
     parser = argparse.ArgumentParser()
     parser.add_argument("--start-agent", action="store_true", help="Start run_suggester.py as a subprocess (debug only).")
     parser.add_argument("--timeout", type=int, default=90, help="Timeout seconds to wait for suggestions.")
-    parser.add_argument("--poll-interval", type=float, default=2.0, help="Polling interval (seconds).")
+    parser.add_argument("--count", type=int, default=1, help="Number of test tickets to create and wait for.")
+    parser.add_argument("--poll-interval", "--max-poll", type=float, default=2.0, help="Max polling interval (seconds); polls back off up to this.")
+    parser.add_argument("--initial-poll", type=float, default=0.1, help="First polling interval (seconds), doubled after each poll.")
     args = parser.parse_args()
 
-    if args.start_agent:
-        # Spawn agent runner in a subprocess when developer wants an integrated debug run.
-        start_agent_subprocess()
+    # Spawn agent runner in a subprocess when developer wants an integrated debug run;
+    # it is stopped when the run ends, whichever way it exits.
+    with agent_subprocess(start=args.start_agent):
+        run_e2e(args)
 
-    # Build a simple unique ticket payload using epoch seconds to avoid collisions.
+
+def run_e2e(args: argparse.Namespace) -> None:
+    """
+    Create the test tickets, wait for the agent to process them and report the
+    outcome; exits the process with the CI status code (see main).
+    """
+    # Build simple unique ticket payloads using epoch seconds to avoid collisions.
     ts = int(time.time())
-    payload = {
-        "title": f"E2E Test Unique {ts}",
-        "description": "Timeouts observed when users checkout. APM shows increased latency.",
-        "reporter": "e2e@test.com"
-    }
+    payloads = [
+        {
+            "title": f"E2E Test Unique {ts}" + (f"-{i}" if args.count > 1 else ""),
+            "description": "Timeouts observed when users checkout. APM shows increased latency.",
+            "reporter": "e2e@test.com"
+        }
+        for i in range(max(1, args.count))
+    ]
 
     logger.info("=== TIMESTAMP === %s", time.strftime("%Y-%m-%d %H:%M:%S %Z", time.localtime()))
     logger.info("Backend base url = %s", BASE)
 
-    # Create ticket and fail fast if backend is unreachable or returns error.
+    # Create tickets and fail fast if backend is unreachable or returns error.
     try:
-        created = create_ticket(payload)
-    except Exception as e:
-        logger.error("Failed to create ticket: %s", e)
-        try:
-            import traceback
-            traceback.print_exc()
-        except Exception:
-            pass
+        if len(payloads) == 1:
+            created_list = [create_ticket(payloads[0])]
+        else:
+            created_list = create_tickets_bulk(payloads)
+    except Exception:
+        # One log record carrying the message and traceback
+        logger.exception("Failed to create ticket")
         sys.exit(2)
 
-    ticket_id = created.get("id")
-    logger.info("Created ticket id=%s", ticket_id)
+    ticket_ids = [created.get("id") for created in created_list]
+    logger.info("Created ticket ids=%s", ticket_ids)
 
-    # Wait for the agent to process and enrich the ticket, otherwise exit non-zero.
+    # Wait for the agent to process and enrich the tickets, otherwise exit non-zero.
     try:
-        processed_ticket = wait_for_processing(ticket_id, timeout=args.timeout, poll_interval=args.poll_interval)
+        if len(ticket_ids) == 1:
+            processed = [wait_for_processing(ticket_ids[0], timeout=args.timeout, poll_interval=args.poll_interval,
+                                             initial_poll=args.initial_poll)]
+        else:
+            processed = wait_for_processing_many(ticket_ids, timeout=args.timeout, poll_interval=args.poll_interval,
+                                                 initial_poll=args.initial_poll)
     except Exception as e:
         logger.error("Ticket processing failed: %s", e)
         # If the exception includes the last-seen JSON, surface it at debug level for triage.
@@ -220,8 +510,11 @@ def main():
             logger.debug("Timeout dump: %s", e.args[0])
         sys.exit(5)
 
-    logger.info("E2E test SUCCESS: ticket processed with suggestions")
-    print(json.dumps({"status": "ok", "ticket": processed_ticket}, indent=2, default=str))
+    logger.info("E2E test SUCCESS: %d ticket(s) processed with suggestions", len(processed))
+    if len(processed) == 1:
+        print(_pretty({"status": "ok", "ticket": processed[0]}))
+    else:
+        print(_pretty({"status": "ok", "tickets": processed}))
     sys.exit(0)
 
 
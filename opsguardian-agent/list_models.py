@@ -1,7 +1,10 @@
-# list_models.py
+# list_models.py  (run with: python list_models.py [--refresh])
 from dotenv import load_dotenv
+import hashlib
+import json
 import os
-from google.genai import Client
+import sys
+import time
 
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
@@ -11,30 +14,56 @@ if not api_key:
     print("ERROR: GOOGLE_API_KEY not found in environment/.env")
     raise SystemExit(1)
 
-client = Client(api_key=api_key)
+# The listing is cached per API key per day; pass --refresh to re-fetch.
+cache_key = hashlib.sha1(api_key.encode()).hexdigest()[:8] + "-" + time.strftime("%Y%m%d")
+cache_path = os.path.join(os.path.expanduser("~"), ".cache", "opsguardian", f"models-{cache_key}.json")
 
-try:
-    pager = client.models.list()
-    print("\n=== AVAILABLE GENAI MODELS ===")
-    count = 0
-    for m in pager:  # iterate the Pager
-        count += 1
-        # defensive field extraction
-        name = getattr(m, "name", None) or getattr(m, "model", None) or str(m)
-        methods = getattr(m, "supported_generation_methods", None)
-        # some model objects show supported_methods or supported_generation_methods
-        if methods is None:
-            methods = getattr(m, "supported_methods", None)
-        # print a short summary plus full repr for debugging
-        print(f"\n[{count}] MODEL NAME: {name}")
-        print("    supported_generation_methods:", methods)
-        try:
-            print("    repr:", repr(m)[:1000])  # avoid too long output
-        except Exception:
-            pass
+entries = None
+if "--refresh" not in sys.argv:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except Exception:
+        entries = None
 
-    if count == 0:
-        print("No models returned by the API call.")
-except Exception as e:
-    print("ERROR listing models:", repr(e))
-    raise
+if entries is None:
+    from google.genai import Client
+
+    client = Client(api_key=api_key)
+    try:
+        entries = []
+        for m in client.models.list():  # iterate the Pager
+            # defensive field extraction
+            name = getattr(m, "name", None) or getattr(m, "model", None) or str(m)
+            methods = getattr(m, "supported_generation_methods", None)
+            # some model objects show supported_methods or supported_generation_methods
+            if methods is None:
+                methods = getattr(m, "supported_methods", None)
+            try:
+                rep = repr(m)[:1000]  # avoid too long output
+            except Exception:
+                rep = None
+            entries.append({"name": name, "methods": methods, "repr": rep})
+    except Exception as e:
+        print("ERROR listing models:", repr(e))
+        raise
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, default=str)
+    except Exception as e:
+        print("WARNING: could not write model cache:", repr(e))
+else:
+    print(f"(cached listing from {cache_path}; use --refresh to re-fetch)")
+
+# Build the whole report first and write it in one go:
+# a short summary plus full repr for debugging per model.
+lines = ["\n=== AVAILABLE GENAI MODELS ==="]
+for count, entry in enumerate(entries, 1):
+    lines.append(f"\n[{count}] MODEL NAME: {entry['name']}")
+    lines.append(f"    supported_generation_methods: {entry['methods']}")
+    if entry.get("repr") is not None:
+        lines.append(f"    repr: {entry['repr']}")
+if not entries:
+    lines.append("No models returned by the API call.")
+sys.stdout.write("\n".join(lines) + "\n")
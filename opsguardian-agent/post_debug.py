@@ -1,5 +1,5 @@
 # post_debug.py
-import os, requests, json
+import os, requests
 
 BASE = os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api").rstrip("/") + "/"
 url = BASE + "tickets"
@@ -8,7 +8,8 @@ payload = {
     "description": "Timeouts observed when users checkout. APM shows increased latency.",
     "reporter": "e2e@test.com"
 }
-resp = requests.post(url, json=payload)
+session = requests.Session()
+resp = session.post(url, json=payload)
 print("POST", url)
 print("STATUS:", resp.status_code)
 print("HEADERS:", resp.headers)
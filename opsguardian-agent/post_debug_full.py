@@ -1,5 +1,7 @@
 # post_debug_full.py  (run with: python post_debug_full.py)
 import os, requests, json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 BASE = os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api").rstrip("/") + "/"
 url = BASE + "tickets"
@@ -22,9 +24,17 @@ payloads = [
     },
 ]
 
-for i, payload in enumerate(payloads, 1):
+# One Session for every attempt, with a connection per concurrent POST kept alive
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=len(payloads)))
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=len(payloads)))
+
+# Send all attempts at once; responses are printed below in payload order
+with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+    responses = list(pool.map(lambda p: session.post(url, json=p, timeout=10), payloads))
+
+for i, resp in enumerate(responses, 1):
     print("\n=== POST attempt", i, "===")
-    resp = requests.post(url, json=payload)
     print("POST", url)
     print("STATUS:", resp.status_code)
     print("HEADERS:", dict(resp.headers))
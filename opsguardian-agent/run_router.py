@@ -1,7 +1,18 @@
 # run_router.py
+import logging
+import sys
+
 from tools.backend_client import BackendClient
 from agents.router_agent import RouterAgent
 
+# Flush stdout per line even when it is a pipe (e.g. CI logs),
+# so progress shows up as it happens rather than in block-sized bursts.
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=True)
+
+# Logging is configured by entry points only; agent modules just create loggers.
+logging.basicConfig(level=logging.INFO)
+
 # If backend is running locally, BackendClient will call it;
 # otherwise RouterAgent will simulate updates (no exceptions).
 backend = BackendClient()  # uses OPS_BACKEND_URL or default http://localhost:8080
@@ -2,20 +2,98 @@
 # Entrypoint script to fetch tickets from backend, run the RouterAgent on each ticket,
 # optionally initialize an ADK runner if ADK modules are present, and emit run metrics.
 
+import functools
+import json
 import os
 import logging
-import traceback
+import sys
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from tools.backend_client import BackendClient
+from tools.backend_client import BackendClient, make_session
 from agents.router_agent import RouterAgent
 
+# Flush stdout per line even when it is a pipe (CI logs, e2e_test --start-agent),
+# so progress shows up as it happens rather than in block-sized bursts.
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=True)
+
 # Configure logging from environment; default to INFO for normal runs
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# Candidate class names to look for in the agents.adk_agent module.
+_AGENT_CLASS_CANDIDATES = ("AdkLlmAgent", "AdKllmAgent", "AdkAgent", "AdKAgent", "Adk_llm_agent")
+# Which candidate worked last time, keyed on the agent module's mtime, so later runs
+# construct it directly instead of probing every name.
+_ADK_PROBE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "opsguardian", "adk_probe.json")
+
+def _load_adk_probe(mod_mtime: float) -> Optional[str]:
+    # Cached winner for this version of agents.adk_agent, or None (missing/stale/unreadable).
+    try:
+        with open(_ADK_PROBE_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("mtime") == mod_mtime:
+            return cached.get("winner")
+    except Exception:
+        pass
+    return None
+
+def _save_adk_probe(mod_mtime: float, winner: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(_ADK_PROBE_CACHE), exist_ok=True)
+        with open(_ADK_PROBE_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"mtime": mod_mtime, "winner": winner}, f)
+    except Exception as e:
+        logger.debug("Could not write ADK probe cache %s: %s", _ADK_PROBE_CACHE, e)
+
+@functools.lru_cache(maxsize=1)
+def _discover_adk_agent() -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Find and instantiate the ADK agent exposed by agents.adk_agent: one of the
+    known class names, else its create_agent() factory. Returns (agent_instance,
+    winner), with winner the class name or "create_agent"; (None, None) if none works.
+    The winner is cached on disk (_ADK_PROBE_CACHE) and tried first next run.
+    """
+    try:
+        import importlib
+        mod = importlib.import_module("agents.adk_agent")
+    except Exception as e:
+        # Module either missing or import failed — ADK not usable
+        logger.debug("agents.adk_agent module not importable: %s", e)
+        return None, None
+
+    try:
+        mod_mtime = os.path.getmtime(mod.__file__)
+    except Exception:
+        mod_mtime = None
+    cached = _load_adk_probe(mod_mtime) if mod_mtime is not None else None
+    candidates = list(_AGENT_CLASS_CANDIDATES) + ["create_agent"]
+    if cached in candidates:
+        candidates.remove(cached)
+        candidates.insert(0, cached)
+
+    for name in candidates:
+        factory = getattr(mod, name, None)
+        if not callable(factory):
+            continue
+        try:
+            agent_instance = factory()
+        except Exception as e:
+            # If instantiation fails, continue trying other names
+            logger.debug("Failed to instantiate %s: %s", name, e)
+            continue
+        if name == "create_agent":
+            logger.info("Created agent_instance using agents.adk_agent.create_agent()")
+        else:
+            logger.info("Found agents.adk_agent.%s — using it for runner creation.", name)
+        if mod_mtime is not None and name != cached:
+            _save_adk_probe(mod_mtime, name)
+        return agent_instance, name
+    return None, None
+
 def try_init_adk_runner():
     """
     Attempt to initialize an ADK runner if ADK runtime and agent modules exist.
@@ -29,39 +107,7 @@ def try_init_adk_runner():
         logger.debug("No adk_runtime.create_runner_with_agent available: %s", e)
         return False
 
-    # Candidate class names to look for in the agents.adk_agent module.
-    agent_class_candidates = ("AdkLlmAgent", "AdKllmAgent", "AdkAgent", "AdKAgent", "Adk_llm_agent")
-    try:
-        import importlib
-        mod = importlib.import_module("agents.adk_agent")
-    except Exception as e:
-        # Module either missing or import failed — ADK not usable
-        logger.debug("agents.adk_agent module not importable: %s", e)
-        return False
-
-    agent_instance = None
-
-    # Try to instantiate a known agent class from the module.
-    for cls_name in agent_class_candidates:
-        cls = getattr(mod, cls_name, None)
-        if cls:
-            try:
-                agent_instance = cls()
-                logger.info("Found agents.adk_agent.%s — using it for runner creation.", cls_name)
-                break
-            except Exception as e:
-                # If instantiation fails, continue trying other names
-                logger.debug("Failed to instantiate %s: %s", cls_name, e)
-
-    # Fall back to factory function create_agent() if class-based instantiation didn't work.
-    if agent_instance is None:
-        factory = getattr(mod, "create_agent", None)
-        if callable(factory):
-            try:
-                agent_instance = factory()
-                logger.info("Created agent_instance using agents.adk_agent.create_agent()")
-            except Exception as e:
-                logger.debug("agents.adk_agent.create_agent() failed: %s", e)
+    agent_instance, _ = _discover_adk_agent()
 
     if agent_instance is None:
         # No usable ADK agent discovered — continue without ADK runner.
@@ -79,12 +125,31 @@ def try_init_adk_runner():
         logger.warning("ADK runner not initialized: %s", e)
         return False
 
-def process_all_tickets(backend: BackendClient, router: RouterAgent):
+# Canonical (upper-case) ticket statuses; these skip the per-ticket .upper() copy.
+_STATUSES = frozenset(("OPEN", "TRIAGED", "ASSIGNED", "IN_PROGRESS", "RESOLVED", "CLOSED"))
+
+def _process_timed(router: RouterAgent, ticket_id) -> Tuple[Dict[str, Any], float]:
+    """
+    Core processing for one ticket: hand its id to the router and return the result
+    dictionary with the seconds it took (measured per ticket, so avg_time_s stays a
+    per-ticket figure when tickets overlap).
+    """
+    start = time.monotonic()
+    result = router.process_ticket(ticket_id)
+    return result, time.monotonic() - start
+
+def process_all_tickets(backend: BackendClient, router_factory: Callable[[], RouterAgent]):
     """
     Fetch tickets from backend and process them through the router.
+    The router is built with router_factory() when the first ticket needs it, so
+    runs that find nothing to process skip router (and ADK) setup entirely.
     By default only tickets with status 'OPEN' are fetched to avoid reprocessing.
     Set PROCESS_OPEN_ONLY=false in environment to fetch all tickets.
 
+    Up to OPS_CONCURRENCY tickets (default 8) are processed at once.
+    Per-ticket results are printed together at the end of the run; set
+    STREAM_RESULTS=true to print each one as soon as its ticket finishes.
+
     Emits simple run-time metrics and logs summary at the end.
     """
     # Determine whether to restrict processing to OPEN tickets (default true)
@@ -93,55 +158,65 @@ def process_all_tickets(backend: BackendClient, router: RouterAgent):
         logger.info("Default behavior: processing only tickets with status=OPEN")
     else:
         logger.info("PROCESS_OPEN_ONLY=false -> will fetch all tickets")
+    stream_results = os.getenv("STREAM_RESULTS", "false").lower() in ("1", "true", "yes")
 
-    # Fetch tickets from backend with defensive error handling
-    try:
-        if process_open_only:
-            tickets = backend.list_tickets(status="OPEN")
-        else:
-            tickets = backend.list_tickets()
-    except Exception as e:
-        logger.error("Failed to list tickets from backend: %s", e)
-        return
-
-    # Validate backend response shape
-    if not isinstance(tickets, list):
-        logger.error("Unexpected tickets payload from backend: %r", tickets)
-        return
-
-    logger.info("Found %d ticket(s) in DB (filtered)", len(tickets))
+    # Tickets are parsed as the listing downloads (with ijson), so processing starts
+    # before the whole list is fetched. The status filter is enforced below as well.
+    tickets = backend.iter_tickets(status="OPEN" if process_open_only else None)
 
     # Metrics counters collected during the run
+    router: Optional[RouterAgent] = None
+    listed = 0
+    result_lines = []
     processed = 0
     fallback_classifications = 0
     fallback_suggestions = 0
     total_time = 0.0
 
-    # Iterate tickets and run routing logic for each
-    for t in tickets:
-        ticket_id = t.get("id")
-        if ticket_id is None:
-            # Defensive: skip malformed ticket entries
-            logger.warning("Skipping ticket with missing id: %r", t)
-            continue
+    # Tickets are routed on a thread pool (OPS_CONCURRENCY in flight, default 8): each
+    # one is dominated by blocking backend/LLM calls. Listing failures stop submission.
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max(1, int(os.getenv("OPS_CONCURRENCY", "8")))) as pool:
+        try:
+            for t in tickets:
+                listed += 1
+                ticket_id = t.get("id")
+                if ticket_id is None:
+                    # Defensive: skip malformed ticket entries
+                    logger.warning("Skipping ticket with missing id: %r", t)
+                    continue
 
-        status = (t.get("status") or "").upper()
+                status = t.get("status") or ""
+                if status not in _STATUSES:
+                    # Only non-canonical spellings (e.g. "open") need normalizing
+                    status = status.upper()
 
-        # HARD GUARD: when PROCESS_OPEN_ONLY is true, never reprocess non-OPEN tickets.
-        if process_open_only and status != "OPEN":
-            logger.info(
-                "Skipping ticket id=%s because status=%s (PROCESS_OPEN_ONLY=true)",
-                ticket_id, status
-            )
-            continue
+                # HARD GUARD: when PROCESS_OPEN_ONLY is true, never reprocess non-OPEN tickets.
+                if process_open_only and status != "OPEN":
+                    logger.info(
+                        "Skipping ticket id=%s because status=%s (PROCESS_OPEN_ONLY=true)",
+                        ticket_id, status
+                    )
+                    continue
 
-        logger.info("Processing ticket id=%s status=%s", ticket_id, status)
+                logger.info("Processing ticket id=%s status=%s", ticket_id, status)
+                if router is None:
+                    router = router_factory()
+                futures[pool.submit(_process_timed, router, ticket_id)] = ticket_id
+        except Exception as e:
+            logger.error("Failed to list tickets from backend: %s", e)
 
-        start = time.time()
-        try:
-            # Core processing: hand ticket id to router and await a result dictionary.
-            result = router.process_ticket(ticket_id)
-            elapsed = time.time() - start
+        # Results are tallied here, on the main thread, as tickets finish.
+        for fut in as_completed(futures):
+            ticket_id = futures[fut]
+            try:
+                result, elapsed = fut.result()
+            except Exception as e:
+                # Log errors per-ticket and continue processing remaining tickets.
+                logger.error("Error while processing ticket id=%s: %s", ticket_id, e)
+                # exc_info: the traceback is only formatted if DEBUG records are emitted
+                logger.debug("Traceback for ticket id=%s:", ticket_id, exc_info=True)
+                continue
             processed += 1
             total_time += elapsed
 
@@ -154,14 +229,13 @@ def process_all_tickets(backend: BackendClient, router: RouterAgent):
             logger.info("Finished processing ticket id=%s (%.2fs). ADK_classification=%s ADK_suggest=%s",
                         ticket_id, elapsed, result.get("used_adk_classification"), result.get("used_adk_suggestions"))
 
-            # Print human-readable result to stdout for operator visibility
-            print("\n=== RESULT FOR TICKET", ticket_id, "===\n")
-            print(result)
-        except Exception as e:
-            # Log errors per-ticket and continue processing remaining tickets.
-            logger.error("Error while processing ticket id=%s: %s", ticket_id, e)
-            logger.debug("Traceback:\n%s", traceback.format_exc())
-            continue
+            # Human-readable result for operator visibility, buffered unless streaming
+            result_lines.append(f"\n=== RESULT FOR TICKET {ticket_id} ===\n\n{result}\n")
+            if stream_results:
+                sys.stdout.write(result_lines.pop())
+                sys.stdout.flush()
+
+    logger.info("Found %d ticket(s) in DB, %d submitted after filtering", listed, len(futures))
 
     # Compute and emit summary metrics after processing completes
     avg_time = (total_time / processed) if processed else 0.0
@@ -172,25 +246,30 @@ def process_all_tickets(backend: BackendClient, router: RouterAgent):
         "avg_time_s": round(avg_time, 3)
     }
     logger.info("Run summary: %s", summary)
-    print("\n=== SUGGESTER RUN SUMMARY ===\n")
-    print(summary)
+    # Buffered results and the summary go out in a single write
+    result_lines.append(f"\n=== SUGGESTER RUN SUMMARY ===\n\n{summary}\n")
+    sys.stdout.write("".join(result_lines))
+    sys.stdout.flush()
 
 def main():
     """
-    Main entrypoint: try to initialize ADK runner (best-effort),
-    create backend client and router, then process tickets.
+    Main entrypoint: create backend client, then process tickets; the ADK runner
+    (best-effort) and router are only set up once there is a ticket to process.
     """
-    try_init_adk_runner()
-
     # Build backend base URL from environment with a sensible default
     base = os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api").rstrip('/') + '/'
     logger.info("Backend base url = %s", base)
 
-    # Create service clients and run processing loop
-    backend = BackendClient(base)
-    router = RouterAgent(backend)
+    # Create service clients and run processing loop; the backend connection pool
+    # is sized for the tickets routed concurrently.
+    concurrency = max(1, int(os.getenv("OPS_CONCURRENCY", "8")))
+    backend = BackendClient(base, session=make_session(pool_size=concurrency * 4))
+
+    def build_router() -> RouterAgent:
+        try_init_adk_runner()
+        return RouterAgent(backend)
 
-    process_all_tickets(backend, router)
+    process_all_tickets(backend, build_router)
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,20 @@
 from dotenv import load_dotenv
 import os
-import google.generativeai as genai
+
+from tools.llm_client import get_model
 
 load_dotenv()
 key = os.getenv("GEMINI_API_KEY")
 
-print("Loaded key?", bool(key))
 
-genai.configure(api_key=key)
+def main():
+    print("Loaded key?", bool(key))
+
+    # Streamed, so text is printed as it is generated rather than after the whole reply
+    for chunk in get_model().generate_content("Hello!", stream=True):
+        print(chunk.text, end="", flush=True)
+    print()
 
-model = genai.GenerativeModel("gemini-1.5-flash")
 
-resp = model.generate_content("Hello!")
-print(resp.text)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from agents import adk_classifier
+from agents.adk_classifier import _KEYWORD_MAP, _match_keyword
+
+
+def _loop_match(text):
+    # The original per-keyword check: the first _KEYWORD_MAP entry contained in text wins.
+    for kw, match in _KEYWORD_MAP.items():
+        if kw in text:
+            return match
+    return None
+
+
+@pytest.fixture(params=["regex", "automaton"])
+def matcher(request, monkeypatch):
+    if request.param == "regex":
+        monkeypatch.setattr(adk_classifier, "_AC", None)
+    elif adk_classifier._AC is None:
+        pytest.skip("pyahocorasick not installed")
+    return _match_keyword
+
+
+@pytest.mark.parametrize("text", [
+    "passwordbox reset",
+    "ünicode passwordbased login",
+    "payment gateway latency",
+    "pay sql timeout",
+    "vpn disk security",
+    "nothing relevant here",
+    "",
+])
+def test_matches_original_loop(matcher, text):
+    assert matcher(text) == _loop_match(text)
+
+
+def test_matches_original_loop_fuzz(matcher):
+    rng = random.Random(1234)
+    pieces = list(_KEYWORD_MAP) + ["x", "ü", " ", "box", "ord", "a", "b", "d"]
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+        assert matcher(text) == _loop_match(text), text
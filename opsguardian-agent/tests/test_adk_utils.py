@@ -0,0 +1,18 @@
+from agents.adk_utils import extract_suggestions_from_adk_response, parse_classification_output
+
+GENAI_ERROR = "Error calling GenAI model: 429 RESOURCE_EXHAUSTED. {'error': {'code': 429, 'message': 'Quota exceeded'}}"
+
+
+def test_genai_error_text_yields_no_suggestions():
+    assert extract_suggestions_from_adk_response(GENAI_ERROR) == []
+
+
+def test_genai_error_text_yields_no_classification():
+    assert parse_classification_output(GENAI_ERROR) is None
+
+
+def test_json_array_suggestions_still_parsed():
+    assert extract_suggestions_from_adk_response('["Restart the pod", "Check DB logs"]') == [
+        "Restart the pod",
+        "Check DB logs",
+    ]
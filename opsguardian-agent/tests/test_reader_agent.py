@@ -0,0 +1,21 @@
+from agents.reader_agent import ReaderAgent
+
+
+def test_alias_fields_are_part_of_the_cache_key():
+    reader = ReaderAgent()
+    a = reader.read({"id": 7, "subject": "DB down", "body": "db timeout"})
+    b = reader.read({"id": 7, "subject": "Login broken", "body": "auth fails", "reporter": "x@y"})
+    assert a is not b
+    assert (b.title, b.description, b.reporter) == ("Login broken", "auth fails", "x@y")
+
+
+def test_reporter_alias_is_part_of_the_cache_key():
+    reader = ReaderAgent()
+    reader.read({"id": 7, "title": "DB down", "createdBy": "a@x"})
+    assert reader.read({"id": 7, "title": "DB down", "createdBy": "b@x"}).reporter == "b@x"
+
+
+def test_identical_payload_is_served_from_cache():
+    reader = ReaderAgent()
+    raw = {"id": "7", "title": "DB down", "description": "db timeout", "status": "OPEN"}
+    assert reader.read(raw) is reader.read(dict(raw))
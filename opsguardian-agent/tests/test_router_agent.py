@@ -0,0 +1,51 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from agents.router_agent import RouterAgent
+from tools.backend_client import BackendClient
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class FakeBackend(BackendClient):
+    # BackendClient's batch helpers over canned per-ticket calls
+    def __init__(self):
+        pass
+
+    def _cached_ticket(self, ticket_id):
+        return None, None
+
+    def get_ticket(self, ticket_id):
+        if ticket_id == 9:
+            return None
+        return {"id": ticket_id, "title": "DB down", "description": f"db timeout {ticket_id}"}
+
+    def update_ticket(self, ticket_id, changes):
+        if ticket_id == 2:
+            raise _http_error(500)
+        return {"id": ticket_id, **changes}
+
+    def triage_ticket(self, ticket_id, payload):
+        raise _http_error(404)
+
+    def add_suggestions(self, ticket_id, payload):
+        return {"id": ticket_id}
+
+
+def test_batch_keeps_results_when_one_ticket_fails():
+    with RouterAgent(FakeBackend()) as router:
+        results = router.process_tickets_batch([1, 9, 2])
+    assert results[0]["resolver_update"]["id"] == 1
+    assert results[1] == {"id": 9, "status": "failed", "error": "Ticket 9 not found"}
+    assert results[2]["resolver_update"] == {"status": "failed", "error": "500 error"}
+    assert results[2]["backend_response"] == {"id": 2}
+
+
+def test_process_ticket_raises_for_unknown_id():
+    with RouterAgent(FakeBackend()) as router, pytest.raises(ValueError):
+        router.process_ticket(9)
@@ -2,93 +2,532 @@
 # Thin HTTP client for interacting with the OpsGuardian backend API.
 # Provides small helper methods that hide URL construction and REST details.
 
+import json
 import requests
+import urllib3
 import os
 import logging
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson  # optional: faster JSON encoding/decoding of request and response bodies
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+try:
+    import ijson  # optional: incremental parsing of the ticket listing in iter_tickets
+except ImportError:
+    ijson = None
+
+_JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json", "User-Agent": "opsguardian-agent"}
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+# Cached in place of a ticket the backend answered 404 for
+_MISSING = object()
+
+
+def _json(r):
+    """
+    Raise for an error status, else return the response's JSON body.
+    """
+    r.raise_for_status()
+    return _json_loads(r.content)
+
+
+def _settled(fn):
+    """
+    fn wrapped to return its exception instead of raising it (return_exceptions=True).
+    """
+    def call(*args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            return e
+    return call
+
+
+# TCP keepalive on pooled backend connections: probe after 30s idle, every 10s,
+# give up after 3 misses, so idle connections survive NAT/proxy idle timeouts
+# between agent steps and dead ones are noticed. Options missing on this
+# platform (TCP_KEEPIDLE is Linux-only) are left out.
+_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+]
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    # HTTPAdapter whose pooled connections are opened with _KEEPALIVE_OPTIONS.
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", HTTPConnection.default_socket_options + _KEEPALIVE_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _retry() -> Retry:
+    # Retry policy shared by make_session and BackendClient.get_ticket_fast
+    return Retry(
+        total=5,
+        connect=3,
+        read=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def make_session(pool_size: int = None) -> requests.Session:
+    """
+    Build a pooled keep-alive requests.Session (pool_size connections, default 4 per
+    CPU and at least 16) with JSON headers and the _retry() policy.
+    """
+    pool_size = pool_size or max(16, (os.cpu_count() or 1) * 4)
+    adapter = _KeepAliveAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=_retry())
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(_JSON_HEADERS)
+    return session
+
+
+def make_httpx_client(pool_size: int = None, timeout: float = 10.0):
+    """
+    Build an httpx.Client usable in place of make_session()'s Session: HTTP/2 when
+    the 'h2' package is installed (many concurrent ticket calls multiplexed on one
+    connection), a keep-alive pool sized like make_session's, and connect retries.
+    Raises ImportError when httpx is not installed.
+    """
+    import httpx
+    try:
+        import h2  # noqa: F401  (enables httpx HTTP/2 support)
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    pool_size = pool_size or max(16, (os.cpu_count() or 1) * 4)
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.Client(
+        transport=httpx.HTTPTransport(http2=http2, limits=limits, retries=3, socket_options=_KEEPALIVE_OPTIONS),
+        timeout=timeout,
+        headers=_JSON_HEADERS,
+    )
+
+
 class BackendClient:
     """
     BackendClient abstracts HTTP communication with the OpsGuardian backend.
     It provides typed helper methods for common operations such as:
-      - listing tickets
-      - retrieving a ticket
+      - listing tickets (all at once or page by page)
+      - retrieving a ticket (or many concurrently)
       - creating or updating tickets
       - posting suggestions
     """
 
-    def __init__(self, base_url=None):
+    def __init__(
+            self,
+            base_url=None,
+            session: requests.Session = None,
+            http: str = None,
+            cache_ttl: float = None,
+            cache_size: int = 1024,
+            negative_ttl: float = None,
+            prewarm: bool = None,
+            timeout=None
+    ):
         """
         Initialize client with a base backend URL.
         When base_url is not provided, fall back to OPS_BACKEND_URL env var
         or default to http://localhost:8080/api.
+        All calls go through one pooled session (keep-alive across calls and threads);
+        pass session to size or share it, otherwise one is built: make_session() by
+        default, or make_httpx_client() (HTTP/2) when http / OPS_BACKEND_HTTP is "httpx".
+        Either way, errors surface as that library's exceptions from raise_for_status.
+
+        Tickets read by get_ticket/get_tickets are kept in a bounded in-memory cache for
+        cache_ttl seconds (OPS_TICKET_CACHE_TTL, default 30; 0 disables), or the
+        response's Cache-Control max-age when it sends one (no-store is honored). After
+        expiry the ticket is revalidated with If-None-Match when the backend sent an
+        ETag, and a 304 counts as a hit. Writes through this client drop the affected
+        tickets. Cached tickets are shared, so callers must not mutate them.
+        A 404 is remembered for negative_ttl seconds (OPS_TICKET_NEGATIVE_TTL, default
+        5; 0 disables), so repeated lookups of a missing id skip the round trip;
+        create_ticket forgets all remembered 404s.
+
+        With prewarm (OPS_BACKEND_PREWARM, default on) a HEAD to the base URL is sent
+        in the background, so the first real call finds an open pooled connection
+        instead of paying the TCP/TLS handshake itself.
+
+        Every call is bounded by timeout: (connect, read) seconds, default (3.05, 10),
+        or OPS_BACKEND_TIMEOUT as "read" or "connect,read". Without it a hung backend
+        would pin pool threads and connections indefinitely.
         """
         base = base_url or os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api")
         self.base = base.rstrip('/') + '/'
+        # Fixed URL prefixes, so per-ticket calls only append the id
+        self._tickets_url = self.base + "tickets"
+        self._tickets_slash = self._tickets_url + "/"
+        # Only a session built here is closed by close(); a passed-in one may be shared.
+        self._owns_session = session is None
+        if session is None:
+            http = (http or os.getenv("OPS_BACKEND_HTTP", "requests")).lower()
+            session = make_httpx_client() if http == "httpx" else make_session()
+        self.session = session
+        # Request bodies are pre-encoded JSON bytes: data= for requests, content= for httpx
+        self._body_kw = "data" if isinstance(session, requests.Session) else "content"
+        self.session.headers.setdefault("Content-Type", "application/json")
+        self.timeout = self._make_timeout(timeout or os.getenv("OPS_BACKEND_TIMEOUT") or (3.05, 10))
+        # ticket_id -> (expires_at monotonic, ETag or None, ticket JSON), LRU-ordered
+        self.cache_ttl = float(os.getenv("OPS_TICKET_CACHE_TTL", "30")) if cache_ttl is None else cache_ttl
+        self.cache_size = cache_size
+        self.negative_ttl = (
+            float(os.getenv("OPS_TICKET_NEGATIVE_TTL", "5")) if negative_ttl is None else negative_ttl
+        )
+        self._ticket_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # urllib3 pool behind get_ticket_fast, built on first use
+        self._fast_pool = None
+        if prewarm is None:
+            prewarm = os.getenv("OPS_BACKEND_PREWARM", "true").lower() not in ("0", "false", "no")
+        if prewarm:
+            threading.Thread(target=self._prewarm, name="backend-prewarm", daemon=True).start()
         logger.debug("BackendClient initialized with base=%s", self.base)
 
+    def _make_timeout(self, timeout):
+        # Normalize "10" / "3.05,10" / 10 / (3.05, 10) into what the session accepts;
+        # None means the client's own timeout.
+        if timeout is None:
+            return self.timeout
+        if isinstance(timeout, str):
+            timeout = tuple(float(v) for v in timeout.split(","))
+            timeout = timeout[0] if len(timeout) == 1 else timeout
+        if isinstance(self.session, requests.Session):
+            return timeout
+        import httpx
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def _prewarm(self):
+        # Best-effort: any status (even 404) leaves a keep-alive connection in the pool.
+        try:
+            self.session.head(self.base, timeout=2)
+        except Exception as e:
+            logger.debug("Backend pre-warm of %s failed: %s", self.base, e)
+
+    def close(self):
+        """
+        Release pooled connections of the client's own session (a session passed
+        to __init__ is left open). Also called on leaving `with BackendClient() as c:`.
+        """
+        if self._owns_session:
+            self.session.close()
+        if self._fast_pool is not None:
+            self._fast_pool.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _body(self, payload):
+        return {self._body_kw: _json_dumps_bytes(payload)}
+
+    def _cached_ticket(self, ticket_id):
+        """
+        Return (ticket, entry): ticket when a still-fresh copy is cached (_MISSING for
+        a remembered 404, else None), and the cache entry, which may hold an ETag to
+        revalidate an expired copy.
+        """
+        with self._cache_lock:
+            entry = self._ticket_cache.get(ticket_id)
+            if entry is None:
+                return None, None
+            self._ticket_cache.move_to_end(ticket_id)
+        return (entry[2] if time.monotonic() < entry[0] else None), entry
+
+    def _cache_ticket(self, ticket_id, ticket, headers=None):
+        if self.cache_ttl <= 0 or self.cache_size <= 0 or ticket is None:
+            return
+        ttl = self.cache_ttl
+        etag = None
+        if headers is not None:
+            control = (headers.get("Cache-Control") or "").lower()
+            if "no-store" in control:
+                self._invalidate(ticket_id)
+                return
+            max_age = _MAX_AGE.search(control)
+            if max_age:
+                ttl = float(max_age.group(1))
+            etag = headers.get("ETag")
+        self._store(ticket_id, ttl, etag, ticket)
+
+    def _cache_missing(self, ticket_id):
+        if self.cache_ttl <= 0 or self.negative_ttl <= 0 or self.cache_size <= 0:
+            self._invalidate(ticket_id)
+            return
+        self._store(ticket_id, self.negative_ttl, None, _MISSING)
+
+    def _store(self, ticket_id, ttl, etag, value):
+        with self._cache_lock:
+            self._ticket_cache[ticket_id] = (time.monotonic() + ttl, etag, value)
+            self._ticket_cache.move_to_end(ticket_id)
+            if len(self._ticket_cache) > self.cache_size:
+                self._ticket_cache.popitem(last=False)
+
+    def _invalidate(self, *ticket_ids):
+        with self._cache_lock:
+            for ticket_id in ticket_ids:
+                self._ticket_cache.pop(ticket_id, None)
+
+    def _forget_missing(self):
+        with self._cache_lock:
+            for ticket_id in [k for k, e in self._ticket_cache.items() if e[2] is _MISSING]:
+                del self._ticket_cache[ticket_id]
+
+    def cache_clear(self):
+        with self._cache_lock:
+            self._ticket_cache.clear()
+
     def list_tickets(self, status: str = None):
         """
         Fetch a list of tickets from backend.
         Optional status param (e.g., "OPEN") filters the tickets on backend side.
         """
-        url = self.base + "tickets"
+        url = self._tickets_url
         params = {}
         if status:
             params["status"] = status
         logger.debug("GET %s params=%s", url, params)
-        r = requests.get(url, params=params)
+        return _json(self.session.get(url, params=params, timeout=self.timeout))
+
+    def iter_tickets(self, status: str = None):
+        """
+        Yield the tickets of list_tickets(status) one at a time. GET /tickets has no
+        paging, so this is one request; with ijson installed (and a requests session)
+        tickets are parsed while the response downloads, so callers start on the first
+        tickets before the rest arrive and the whole list is never held in memory
+        (a non-list payload then yields nothing). Without ijson, raises ValueError if
+        the backend returns something other than a list.
+        """
+        url = self._tickets_url
+        params = {"status": status} if status else {}
+        logger.debug("GET %s params=%s", url, params)
+        if ijson is not None and isinstance(self.session, requests.Session):
+            with self.session.get(url, params=params, stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                r.raw.decode_content = True
+                yield from ijson.items(r.raw, "item", use_float=True)
+            return
+        r = self.session.get(url, params=params, timeout=self.timeout)
         r.raise_for_status()
-        return r.json()
+        tickets = _json_loads(r.content)
+        if not isinstance(tickets, list):
+            raise ValueError(f"Unexpected tickets payload from backend: {tickets!r}")
+        yield from tickets
 
     def get_ticket(self, ticket_id):
         """
-        Retrieve a ticket by its ID.
+        Retrieve a ticket by its ID (from the cache while fresh; see __init__).
         Returns None if backend responds with 404, otherwise returns JSON.
         """
-        r = requests.get(self.base + f"tickets/{ticket_id}")
+        ticket, entry = self._cached_ticket(ticket_id)
+        if ticket is not None:
+            return None if ticket is _MISSING else ticket
+        headers = {"If-None-Match": entry[1]} if entry is not None and entry[1] else None
+        r = self.session.get(self._tickets_slash + str(ticket_id), headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and entry is not None:
+            self._cache_ticket(ticket_id, entry[2], r.headers)
+            return entry[2]
         if r.status_code == 404:
+            self._cache_missing(ticket_id)
             return None
         r.raise_for_status()
-        return r.json()
+        ticket = _json_loads(r.content)
+        self._cache_ticket(ticket_id, ticket, r.headers)
+        return ticket
+
+    def _get_fast_pool(self):
+        with self._cache_lock:
+            if self._fast_pool is None:
+                timeout = self.timeout
+                if isinstance(timeout, tuple):
+                    timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+                elif not isinstance(timeout, (int, float)):  # httpx.Timeout
+                    timeout = urllib3.Timeout(connect=timeout.connect, read=timeout.read)
+                self._fast_pool = urllib3.PoolManager(
+                    num_pools=4,
+                    maxsize=max(16, (os.cpu_count() or 1) * 4),
+                    retries=_retry(),
+                    timeout=timeout,
+                    headers=_JSON_HEADERS,
+                    socket_options=HTTPConnection.default_socket_options + _KEEPALIVE_OPTIONS,
+                )
+            return self._fast_pool
+
+    def get_ticket_fast(self, ticket_id):
+        """
+        get_ticket over a bare urllib3 pool (same retries, timeouts, keepalive and
+        ticket cache), skipping the requests/httpx layer for tight loops that fetch
+        many tickets. Opt-in: it keeps its own connections alongside the session's.
+        Returns None on 404; other error statuses raise requests.HTTPError.
+        """
+        ticket, entry = self._cached_ticket(ticket_id)
+        if ticket is not None:
+            return None if ticket is _MISSING else ticket
+        url = self._tickets_slash + str(ticket_id)
+        headers = _JSON_HEADERS
+        if entry is not None and entry[1]:
+            headers = {**_JSON_HEADERS, "If-None-Match": entry[1]}
+        r = self._get_fast_pool().request("GET", url, headers=headers)
+        if r.status == 304 and entry is not None:
+            self._cache_ticket(ticket_id, entry[2], r.headers)
+            return entry[2]
+        if r.status == 404:
+            self._cache_missing(ticket_id)
+            return None
+        if r.status >= 400:
+            raise requests.HTTPError(f"{r.status} Error for url: {url}")
+        ticket = _json_loads(r.data)
+        self._cache_ticket(ticket_id, ticket, r.headers)
+        return ticket
+
+    def get_tickets(self, ticket_ids, max_workers: int = 16, return_exceptions: bool = False):
+        """
+        Retrieve many tickets, in input order (None for ids the backend does not know).
+        Fresh cached tickets are used as is; the rest are fetched with concurrent
+        get_ticket calls (the backend has no batch-get endpoint, and its GET /tickets
+        has no ids filter). A failing fetch raises, or with return_exceptions=True
+        takes that id's slot as the exception so the other tickets are still returned.
+        """
+        ticket_ids = list(ticket_ids)
+        if not ticket_ids:
+            return []
+        found = {}
+        for i in dict.fromkeys(ticket_ids):
+            ticket, _ = self._cached_ticket(i)
+            if ticket is not None:
+                found[i] = None if ticket is _MISSING else ticket
+        to_fetch = [i for i in dict.fromkeys(ticket_ids) if i not in found]
+        if not to_fetch:
+            return [found[i] for i in ticket_ids]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_fetch))) as pool:
+            fetch = _settled(self.get_ticket) if return_exceptions else self.get_ticket
+            found.update(zip(to_fetch, pool.map(fetch, to_fetch)))
+        return [found[i] for i in ticket_ids]
+
+    def get_tickets_parallel(self, ticket_ids, max_workers: int = 8):
+        """
+        Fetch tickets with up to max_workers concurrent get_ticket calls (no batch
+        request) and return them keyed by id (None for unknown ids). The threads
+        share the session's keep-alive pool, which make_session sizes for at least
+        16 connections, so none waits for a connection at the default max_workers.
+        """
+        ticket_ids = list(dict.fromkeys(ticket_ids))
+        if not ticket_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ticket_ids)))) as pool:
+            return dict(zip(ticket_ids, pool.map(self.get_ticket, ticket_ids)))
 
     def create_ticket(self, ticket):
         """
         POST a new ticket to backend and return the created ticket JSON.
+        Remembered 404s are dropped, since the new ticket may take one of those ids.
         """
-        r = requests.post(self.base + "tickets", json=ticket)
-        r.raise_for_status()
-        return r.json()
+        self._forget_missing()
+        return _json(self.session.post(self._tickets_url, **self._body(ticket), timeout=self.timeout))
 
     def update_ticket(self, ticket_id, changes):
         """
         PUT an update payload (priority/category/status) to an existing ticket.
         Returns updated ticket JSON.
         """
-        r = requests.put(self.base + f"tickets/{ticket_id}", json=changes)
-        r.raise_for_status()
-        return r.json()
+        self._invalidate(ticket_id)
+        return _json(self.session.put(self._tickets_slash + str(ticket_id), **self._body(changes), timeout=self.timeout))
+
+    def bulk_update_tickets(self, updates, max_workers: int = 16, return_exceptions: bool = False):
+        """
+        Apply many ticket updates, given as (ticket_id, changes) pairs, and return
+        updated ticket JSON in input order. The PUTs are issued concurrently rather
+        than one after another; the first failing request's exception is raised, or
+        with return_exceptions=True is returned in that update's slot.
+        """
+        updates = list(updates)
+        if not updates:
+            return []
+        update = _settled(self.update_ticket) if return_exceptions else self.update_ticket
+        if len(updates) == 1:
+            return [update(*updates[0])]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(updates))) as pool:
+            return list(pool.map(lambda u: update(*u), updates))
 
-    def add_suggestions(self, ticket_id, payload):
+    def update_tickets(self, changes):
+        """
+        Apply {ticket_id: changes} updates (see bulk_update_tickets) and return the
+        updated tickets keyed by id.
+        """
+        return dict(zip(changes, self.bulk_update_tickets(changes.items())))
+
+    def triage_ticket(self, ticket_id, payload, timeout=None):
+        """
+        PUT classification/status and suggestions together to /tickets/{id}/triage:
+        {"priority", "category", "status", "suggestions"}. One round trip instead of
+        update_ticket + add_suggestions. Returns updated ticket JSON; raises HTTPError
+        (404/405) on backends without the endpoint. timeout overrides the client's.
+        """
+        self._invalidate(ticket_id)
+        return _json(self.session.put(
+            self._tickets_slash + str(ticket_id) + "/triage", **self._body(payload),
+            timeout=self._make_timeout(timeout)
+        ))
+
+    def add_suggestions(self, ticket_id, payload, timeout=None):
         """
         POST suggestions to /tickets/{id}/suggestions.
         Backend is expected to process and merge them accordingly.
+        timeout overrides the client's (e.g. for backends that process them inline).
         """
-        r = requests.post(self.base + f"tickets/{ticket_id}/suggestions", json=payload)
-        r.raise_for_status()
-        return r.json()
+        self._invalidate(ticket_id)
+        return _json(self.session.post(
+            self._tickets_slash + str(ticket_id) + "/suggestions", **self._body(payload),
+            timeout=self._make_timeout(timeout)
+        ))
 
-    def post_at_path(self, path, payload):
+    def post_at_path(self, path, payload, timeout=None):
         """
         Generic POST helper for backward compatibility.
         Used when add_suggestions() may not exist or fails, so caller can POST directly
         to a known backend path such as "/tickets/123/suggestions".
+        timeout overrides the client's.
         """
         if path.startswith("/"):
             path = path[1:]
         url = self.base + path
         logger.debug("POST %s", url)
-        r = requests.post(url, json=payload)
-        r.raise_for_status()
-        return r.json()
+        # Any ticket may be affected by an arbitrary path, so drop all cached tickets.
+        self.cache_clear()
+        return _json(self.session.post(
+            url, **self._body(payload),
+            timeout=self._make_timeout(timeout)
+        ))
+
+
+__all__ = ["BackendClient", "make_session", "make_httpx_client"]
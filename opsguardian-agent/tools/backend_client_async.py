@@ -0,0 +1,158 @@
+# tools/backend_client_async.py
+# Async counterpart of BackendClient for callers that run an event loop: the same
+# helper methods as coroutines, so many ticket calls can be in flight at once
+# (asyncio.gather) over one pool of keep-alive connections.
+
+import asyncio
+import logging
+import os
+
+try:
+    import httpx  # optional: installed alongside google-genai
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBackendClient:
+    """
+    AsyncBackendClient mirrors BackendClient's helpers as coroutines, e.g.
+
+        async with AsyncBackendClient() as client:
+            tickets = await asyncio.gather(*(client.get_ticket(i) for i in ids))
+
+    Requests go through one httpx.AsyncClient (created on first use, so it binds to
+    the running loop) holding up to max_connections keep-alive connections.
+    HTTP errors raise httpx.HTTPStatusError, as raise_for_status does.
+    """
+
+    def __init__(self, base_url=None, max_connections: int = 32, timeout: float = 10.0):
+        """
+        Initialize client with a base backend URL.
+        When base_url is not provided, fall back to OPS_BACKEND_URL env var
+        or default to http://localhost:8080/api.
+        """
+        if httpx is None:
+            raise ImportError("AsyncBackendClient requires httpx (pip install httpx)")
+        base = base_url or os.getenv("OPS_BACKEND_URL", "http://localhost:8080/api")
+        self.base = base.rstrip('/') + '/'
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self._timeout = timeout
+        self._client = None
+        logger.debug("AsyncBackendClient initialized with base=%s", self.base)
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base,
+                limits=self._limits,
+                timeout=self._timeout,
+                headers={"Accept": "application/json", "User-Agent": "opsguardian-agent"},
+            )
+        return self._client
+
+    async def close(self):
+        """
+        Close the pooled connections. Also called on leaving `async with`.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def list_tickets(self, status: str = None):
+        """
+        Fetch a list of tickets from backend (optionally filtered by status).
+        """
+        params = {"status": status} if status else {}
+        logger.debug("GET %stickets params=%s", self.base, params)
+        r = await self.client.get("tickets", params=params)
+        r.raise_for_status()
+        return r.json()
+
+    async def get_ticket(self, ticket_id):
+        """
+        Retrieve a ticket by its ID.
+        Returns None if backend responds with 404, otherwise returns JSON.
+        """
+        r = await self.client.get(f"tickets/{ticket_id}")
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    async def get_tickets(self, ticket_ids):
+        """
+        Retrieve many tickets with concurrent get_ticket calls, in input order
+        (None for unknown ids), as BackendClient.get_tickets does.
+        """
+        ticket_ids = list(ticket_ids)
+        if not ticket_ids:
+            return []
+        unique = list(dict.fromkeys(ticket_ids))
+        found = dict(zip(unique, await asyncio.gather(*(self.get_ticket(i) for i in unique))))
+        return [found[i] for i in ticket_ids]
+
+    async def create_ticket(self, ticket):
+        """
+        POST a new ticket to backend and return the created ticket JSON.
+        """
+        r = await self.client.post("tickets", json=ticket)
+        r.raise_for_status()
+        return r.json()
+
+    async def update_ticket(self, ticket_id, changes):
+        """
+        PUT an update payload (priority/category/status) to an existing ticket.
+        Returns updated ticket JSON.
+        """
+        r = await self.client.put(f"tickets/{ticket_id}", json=changes)
+        r.raise_for_status()
+        return r.json()
+
+    async def bulk_update_tickets(self, updates):
+        """
+        Apply many (ticket_id, changes) updates concurrently. Returns updated ticket
+        JSON in input order; the first failing request's exception is raised.
+        """
+        return list(await asyncio.gather(*(self.update_ticket(*u) for u in updates)))
+
+    async def triage_ticket(self, ticket_id, payload):
+        """
+        PUT classification/status and suggestions together to /tickets/{id}/triage
+        (see BackendClient.triage_ticket). Raises HTTPStatusError (404/405) on
+        backends without the endpoint.
+        """
+        r = await self.client.put(f"tickets/{ticket_id}/triage", json=payload)
+        r.raise_for_status()
+        return r.json()
+
+    async def add_suggestions(self, ticket_id, payload):
+        """
+        POST suggestions to /tickets/{id}/suggestions.
+        """
+        r = await self.client.post(f"tickets/{ticket_id}/suggestions", json=payload)
+        r.raise_for_status()
+        return r.json()
+
+    async def post_at_path(self, path, payload):
+        """
+        Generic POST helper to a backend path such as "/tickets/123/suggestions".
+        """
+        if path.startswith("/"):
+            path = path[1:]
+        logger.debug("POST %s%s", self.base, path)
+        r = await self.client.post(path, json=payload)
+        r.raise_for_status()
+        return r.json()
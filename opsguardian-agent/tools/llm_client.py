@@ -0,0 +1,33 @@
+# tools/llm_client.py
+# Process-wide Gemini models for the google.generativeai SDK (temp_ai_test.py and
+# ad-hoc scripts). Agent code uses the google.genai client shared by
+# agents.adk_agent instead.
+
+import functools
+import os
+import threading
+
+_MODEL_LOCK = threading.Lock()
+
+
+def get_model(name: str = "gemini-1.5-flash"):
+    """
+    Return the shared GenerativeModel for name, built on first use with
+    GEMINI_API_KEY. Reusing it keeps the SDK's HTTP connections (and auth) warm
+    across calls, so callers should use this rather than constructing
+    GenerativeModel themselves. Construction is serialized like
+    agents.adk_agent._get_client, so concurrent first calls build one model.
+    """
+    with _MODEL_LOCK:
+        return _build_model(name)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_model(name: str):
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(name)
+
+
+__all__ = ["get_model"]
@@ -2,6 +2,8 @@ package com.opsguardian.backend;
 
 import org.springframework.boot.SpringApplication;
 import org.springframework.boot.autoconfigure.SpringBootApplication;
+import org.springframework.context.annotation.Bean;
+import org.springframework.web.filter.ShallowEtagHeaderFilter;
 
 @SpringBootApplication
 public class OpsguardianApplication {
@@ -10,4 +12,11 @@ public class OpsguardianApplication {
         SpringApplication.run(OpsguardianApplication.class, args);
     }
 
+    // Adds an ETag to GET responses and answers matching If-None-Match with 304,
+    // so clients polling an unchanged ticket skip the body transfer
+    @Bean
+    public ShallowEtagHeaderFilter shallowEtagHeaderFilter() {
+        return new ShallowEtagHeaderFilter();
+    }
+
 }
@@ -142,4 +142,32 @@ public class TicketController {
 
         return ResponseEntity.ok(updated);
     }
+
+    @PutMapping("/{id}/triage")
+    // Applies the agent's triage in one call: the field update of PUT /{id}
+    // followed by the suggestion append of POST /{id}/suggestions
+    public ResponseEntity<Ticket> triage(
+            @PathVariable Long id,
+            @RequestBody Map<String, Object> changes
+    ) {
+        String priority = (String) changes.get("priority");
+        String category = (String) changes.get("category");
+        String status   = (String) changes.get("status");
+
+        List<String> suggestions = new ArrayList<>();
+        Object maybeList = changes.get("suggestions");
+        if (maybeList instanceof List) {
+            for (Object o : (List<?>) maybeList) {
+                if (o != null) suggestions.add(String.valueOf(o));
+            }
+        }
+
+        Ticket updated = service.triage(id, priority, category, status, suggestions);
+
+        if (updated == null) {
+            return ResponseEntity.notFound().build();
+        }
+
+        return ResponseEntity.ok(updated);
+    }
 }
@@ -3,6 +3,7 @@ package com.opsguardian.backend.service;
 import com.opsguardian.backend.model.Ticket;
 import com.opsguardian.backend.repository.TicketRepository;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
 
 import java.time.Instant;
 import java.util.ArrayList;
@@ -93,4 +94,16 @@ public class TicketService {
                 .orElse(null);
     }
 
+    // Apply a triage result atomically: updateFields, then addSuggestions when
+    // there are any (which moves the ticket to ASSIGNED, as the separate calls do).
+    // Returns null if the ticket is not found.
+    @Transactional
+    public Ticket triage(Long id, String priority, String category, String status, List<String> suggestions) {
+        Ticket updated = updateFields(id, priority, category, status);
+        if (updated == null || suggestions.isEmpty()) {
+            return updated;
+        }
+        return addSuggestions(id, suggestions);
+    }
+
 }